@@ -10,7 +10,7 @@ import logging
 import argparse
 from synscan import SynScanProtocol
 from stellarium_sync import StellariumSync
-from ui import SkyWatcherUI
+from ui import SkyWatcherUI, SecondCachedFormatter
 from config import load_config, save_config
 
 
@@ -21,11 +21,13 @@ def setup_logging(level=logging.INFO):
     Args:
         level: 日志级别
     """
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
+    # 时间戳的秒级部分按秒缓存，毫秒由 %(msecs) 单独输出
+    handler = logging.StreamHandler()
+    handler.setFormatter(SecondCachedFormatter(
+        '%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    ))
+    logging.basicConfig(level=level, handlers=[handler])
 
 
 def main():
@@ -6,9 +6,12 @@ Stellarium 位置同步模块
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import threading
 import time
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime, timezone
 
 
@@ -39,6 +42,9 @@ class StellariumSync:
         self.base_url = base_url.rstrip('/')
         self.api_url = f"{self.base_url}/api"
 
+        # 每个线程一个 requests.Session，复用 keep-alive 连接
+        self._local = threading.local()
+
         # 设置日志
         self.logger = logging.getLogger('StellariumSync')
         self.logger.setLevel(logging.DEBUG)
@@ -51,6 +57,29 @@ class StellariumSync:
         self.goto_count = 0
         self.color_index = 0
 
+        # 时区属性 (类型, key) 缓存：属性列表在同一Stellarium会话内不变，只查询一次
+        self._tz_prop: Optional[Tuple[str, str]] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """当前线程的HTTP会话(Session 不保证线程安全，监控同步线程与网络I/O线程各用一个)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        """创建针对单一Stellarium主机的会话：连接池只需1个连接；连接失败快速重试。
+        状态码重试仅限默认的幂等方法(GET等)，POST脚本不会被重复执行。"""
+        session = requests.Session()
+        retry = Retry(total=2, connect=2, read=0, backoff_factor=0.1,
+                      status_forcelist=(502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def test_connection(self) -> bool:
         """
         测试与Stellarium的连接
@@ -59,7 +88,7 @@ class StellariumSync:
             bool: 连接是否成功
         """
         try:
-            response = requests.get(f"{self.api_url}/main/status", timeout=2)
+            response = self.session.get(f"{self.api_url}/main/status", timeout=2)
             if response.status_code == 200:
                 self.logger.info("Stellarium连接成功")
                 return True
@@ -81,19 +110,17 @@ class StellariumSync:
         Returns:
             (ra_str, dec_str): 格式化的字符串
         """
-        # RA: 度转换为小时 (360度 = 24小时)
-        ra_hours = ra_deg / 15.0
-        ra_h = int(ra_hours)
-        ra_m = int((ra_hours - ra_h) * 60)
-        ra_s = int(((ra_hours - ra_h) * 60 - ra_m) * 60)
+        # RA: 度转换为时分秒 (360度 = 24小时)，先取整为总秒数再 divmod，避免浮点截断误差
+        ra_total_s = int(round(ra_deg * 240.0)) % 86400  # 舍入到24h时回绕为0h
+        ra_h, rem = divmod(ra_total_s, 3600)
+        ra_m, ra_s = divmod(rem, 60)
         ra_str = f"{ra_h:02d}h{ra_m:02d}m{ra_s:02d}s"
 
         # DEC: 度分秒
         dec_sign = '+' if dec_deg >= 0 else '-'
-        dec_abs = abs(dec_deg)
-        dec_d = int(dec_abs)
-        dec_m = int((dec_abs - dec_d) * 60)
-        dec_s = int(((dec_abs - dec_d) * 60 - dec_m) * 60)
+        dec_total_s = int(round(abs(dec_deg) * 3600.0))
+        dec_d, rem = divmod(dec_total_s, 3600)
+        dec_m, dec_s = divmod(rem, 60)
         dec_str = f"{dec_sign}{dec_d:02d}d{dec_m:02d}m{dec_s:02d}s"
 
         return (ra_str, dec_str)
@@ -130,7 +157,7 @@ MarkerMgr.markerEquatorial("{ra_str}", "{dec_str}", true, true, "dotted", "{colo
 
         try:
             self.logger.info("执行Stellarium脚本(更新位置):\n%s", script)
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/scripts/direct",
                 data={"code": script},
                 timeout=2
@@ -213,7 +240,7 @@ MarkerMgr.markerEquatorial("{ra_str}", "{dec_str}", true, true, "dotted", "{colo
                     f"}}\n"
                 )
             self.logger.info("执行Stellarium脚本(标记点):\n%s", script)
-            resp = requests.post(f"{self.api_url}/scripts/direct", data={"code": script}, timeout=2)
+            resp = self.session.post(f"{self.api_url}/scripts/direct", data={"code": script}, timeout=2)
             if resp.status_code == 200:
                 self.logger.debug(
                     f"✓ 已标记点 RA={ra_deg:.3f}° DEC={dec_deg:.3f}° 颜色={use_color}"
@@ -255,7 +282,7 @@ var dec = {dec_deg};
 
         try:
             self.logger.info("执行Stellarium脚本(指向位置):\n%s", script)
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/scripts/direct",
                 data={"code": script},
                 timeout=2
@@ -276,7 +303,7 @@ var dec = {dec_deg};
 
         try:
             self.logger.info("执行Stellarium脚本(清除标记):\n%s", script)
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/scripts/direct",
                 data={"code": script},
                 timeout=2
@@ -305,18 +332,19 @@ var dec = {dec_deg};
         color = self.COLORS[self.color_index]
 
         # 绘制路径 (不清除旧路径,所有点使用统一颜色)
-        script = f'// 绘制路径 #{self.goto_count} (颜色: {color})\n'
+        lines = [f'// 绘制路径 #{self.goto_count} (颜色: {color})']
 
         # 在起点和终点之间绘制多个点来模拟线条
+        # 使用 MarkerMgr 画中心对齐的十字标记，避免文本偏移；颜色固定，模板只需代入坐标
         num_points = 30  # 增加点数使线条更平滑
+        marker_fmt = 'MarkerMgr.markerEquatorial("%s", "%s", true, true, "dotted", "' + color + '", 6.0, false, 0, true);'
+        d_ra = end_ra - start_ra
+        d_dec = end_dec - start_dec
         for i in range(num_points + 1):
             t = i / num_points
             # 线性插值
-            mid_ra = start_ra + (end_ra - start_ra) * t
-            mid_dec = start_dec + (end_dec - start_dec) * t
-            mid_ra_str, mid_dec_str = self.ra_dec_to_hms_dms(mid_ra, mid_dec)
-            # 使用 MarkerMgr 画中心对齐的十字标记，避免文本偏移
-            script += f'MarkerMgr.markerEquatorial("{mid_ra_str}", "{mid_dec_str}", true, true, "dotted", "{color}", 6.0, false, 0, true);\n'
+            lines.append(marker_fmt % self.ra_dec_to_hms_dms(start_ra + d_ra * t, start_dec + d_dec * t))
+        script = "\n".join(lines) + "\n"
 
         # 打印完整脚本
         self.logger.info("=" * 80)
@@ -327,7 +355,7 @@ var dec = {dec_deg};
 
         try:
             self.logger.info("执行Stellarium脚本(绘制路径 #%s, 颜色: %s):\n%s", self.goto_count, color, script)
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/scripts/direct",
                 data={"code": script},
                 timeout=2
@@ -368,7 +396,7 @@ try { if (MarkerMgr && MarkerMgr.deleteByType) {
 
         try:
             self.logger.info("执行Stellarium脚本(清除所有绘制):\n%s", script)
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/scripts/direct",
                 data={"code": script},
                 timeout=2
@@ -401,7 +429,7 @@ try { if (MarkerMgr && MarkerMgr.deleteByType) {
             # 直接使用 RemoteControl 的对象信息接口：若不传 name，则返回当前“选中对象”的信息
             url = f"{self.api_url}/objects/info"
             params = {"format": "json"}
-            response = requests.get(url, params=params, timeout=2)
+            response = self.session.get(url, params=params, timeout=2)
             if response.status_code != 200:
                 # 一些版本可能不支持该端点，避免刷屏，仅调试日志
                 self.logger.debug(f"获取选中目标信息失败: {response.status_code}")
@@ -489,7 +517,7 @@ try { if (MarkerMgr && MarkerMgr.deleteByType) {
                 "country": "Custom",
                 "planet": "Earth",
             }
-            resp = requests.post(f"{self.api_url}/location/setlocationfields", data=data, timeout=2)
+            resp = self.session.post(f"{self.api_url}/location/setlocationfields", data=data, timeout=2)
             ok = (resp.status_code == 200)
             if ok:
                 self.logger.info(f"✓ Stellarium地点已设置: lat={latitude}, lon={longitude}, alt={altitude}, name={data['name']}")
@@ -534,7 +562,7 @@ try { if (MarkerMgr && MarkerMgr.deleteByType) {
                 dt_utc = dt.astimezone(timezone.utc)
             jd = self._datetime_to_julian_day(dt_utc)
             # 仅设置时间，不修改timerate，避免意外暂停时间流
-            resp = requests.post(f"{self.api_url}/main/time", data={"time": str(jd)}, timeout=2)
+            resp = self.session.post(f"{self.api_url}/main/time", data={"time": str(jd)}, timeout=2)
             ok = (resp.status_code == 200)
             if ok:
                 self.logger.info(f"✓ Stellarium时间已设置: JD={jd:.6f} (UTC {dt_utc.isoformat()})")
@@ -545,62 +573,53 @@ try { if (MarkerMgr && MarkerMgr.deleteByType) {
             self.logger.error(f"设置Stellarium时间异常: {e}")
             return False
 
-    def set_timezone_shift_hours(self, tz_hours: float) -> bool:
-        """尝试设置Stellarium的时区偏移(小时)。不同版本key不同，尽力匹配。"""
-        try:
-            lst = requests.get(f"{self.api_url}/stelproperty/list", timeout=2)
-            if lst.status_code != 200:
-                self.logger.error(f"获取Stellarium属性列表失败: {lst.status_code}")
-                return False
-            props = lst.json() if hasattr(lst, 'json') else {}
-            # 优先寻找包含 gmtShift 的可写属性
-            candidates = []
+    def _find_tz_property(self) -> Optional[Tuple[str, str]]:
+        """查找可写的时区属性，返回 ('shift', key) 或 ('name', key)，结果缓存在实例上"""
+        if self._tz_prop is not None:
+            return self._tz_prop
+        lst = self.session.get(f"{self.api_url}/stelproperty/list", timeout=2)
+        if lst.status_code != 200:
+            self.logger.error(f"获取Stellarium属性列表失败: {lst.status_code}")
+            return None
+        props = lst.json() if hasattr(lst, 'json') else {}
+        # 优先寻找包含 gmtShift 的可写属性，次选 timeZone 名称属性
+        for kind, needle in (('shift', 'gmtShift'), ('name', 'timeZone')):
             for key, meta in props.items():
                 try:
-                    if ("gmtShift" in key) and bool(meta.get("isWritable", False)):
-                        candidates.append(key)
+                    if (needle in key) and bool(meta.get("isWritable", False)):
+                        self._tz_prop = (kind, key)
+                        return self._tz_prop
                 except Exception:
                     pass
-            # 次选 timeZone 名称属性
-            tz_name_key = None
-            if not candidates:
-                for key, meta in props.items():
-                    try:
-                        if ("timeZone" in key) and bool(meta.get("isWritable", False)):
-                            tz_name_key = key
-                            break
-                    except Exception:
-                        pass
+        return None
+
+    def set_timezone_shift_hours(self, tz_hours: float) -> bool:
+        """尝试设置Stellarium的时区偏移(小时)。不同版本key不同，尽力匹配。"""
+        try:
+            found = self._find_tz_property()
+            kind, key = found if found else (None, None)
             # 执行设置
-            if candidates:
-                key = candidates[0]
-                resp = requests.post(f"{self.api_url}/stelproperty/set", data={"id": key, "value": str(float(tz_hours))}, timeout=2)
+            if kind == 'shift':
+                resp = self.session.post(f"{self.api_url}/stelproperty/set", data={"id": key, "value": str(float(tz_hours))}, timeout=2)
                 if resp.status_code != 200:
                     self.logger.error(f"✗ 设置{key}失败: {resp.status_code}")
+                    self._tz_prop = None
                     return False
                 self.logger.info(f"✓ 设置{key}={tz_hours}")
-            elif tz_name_key:
+            elif kind == 'name':
                 sign = '+' if tz_hours >= 0 else '-'
                 hh = int(abs(tz_hours))
                 mm = int(round((abs(tz_hours) - hh) * 60))
                 tz_label = f"UTC{sign}{hh:02d}:{mm:02d}"
-                resp = requests.post(f"{self.api_url}/stelproperty/set", data={"id": tz_name_key, "value": tz_label}, timeout=2)
+                resp = self.session.post(f"{self.api_url}/stelproperty/set", data={"id": key, "value": tz_label}, timeout=2)
                 if resp.status_code != 200:
-                    self.logger.error(f"✗ 设置{tz_name_key}失败: {resp.status_code}")
+                    self.logger.error(f"✗ 设置{key}失败: {resp.status_code}")
+                    self._tz_prop = None
                     return False
-                self.logger.info(f"✓ 设置{tz_name_key}={tz_label}")
+                self.logger.info(f"✓ 设置{key}={tz_label}")
             else:
                 self.logger.warning("未找到可写的gmtShift/timeZone属性，跳过Stellarium时区设置")
                 return False
-            # 校验
-            st = requests.get(f"{self.api_url}/main/status", timeout=2)
-            if st.status_code == 200:
-                try:
-                    g = float(st.json().get("time", {}).get("gmtShift"))
-                    if abs(g - float(tz_hours)) < 0.01:
-                        return True
-                except Exception:
-                    pass
             return True
         except Exception as e:
             self.logger.error(f"设置Stellarium时区异常: {e}")
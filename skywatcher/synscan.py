@@ -8,10 +8,46 @@ SkyWatcher SynScan 协议实现
 import serial
 import time
 import logging
-from typing import Optional, Tuple
+import threading
+import functools
+from datetime import datetime
+from typing import List, Optional, Tuple
 import struct
 
 
+class MountReadError(Exception):
+    """读取赤道仪坐标失败，附带两轴的原始响应(失败轴为None)"""
+
+    def __init__(self, ra_resp: Optional[str], dec_resp: Optional[str]):
+        super().__init__(f"读取坐标失败 - RA响应: {ra_resp!r}, DEC响应: {dec_resp!r}")
+        self.ra_resp = ra_resp
+        self.dec_resp = dec_resp
+
+
+def _locked(method):
+    """串口事务加锁: 一次写入+读取响应期间不被其他线程插入命令"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def gmst_deg(dt_utc: datetime) -> float:
+    """UTC -> 格林尼治平恒星时(度, 0-360)。Meeus 公式，儒略日与GMST合并计算，只保留相对J2000的天数。"""
+    y, m = dt_utc.year, dt_utc.month
+    d = dt_utc.day + (dt_utc.hour + (dt_utc.minute + (dt_utc.second + dt_utc.microsecond/1e6)/60.0)/60.0)/24.0
+    if m <= 2:
+        y -= 1
+        m += 12
+    A = y // 100
+    # JD - 2451545.0 (J2000.0)
+    days = int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + d + (2 - A + A // 4) - 1524.5 - 2451545.0
+    t = days / 36525.0
+    t2 = t * t
+    return (280.46061837 + 360.98564736629 * days + 0.000387933 * t2 - t2 * t / 38710000.0) % 360.0
+
+
 class SynScanProtocol:
     """SkyWatcher SynScan 协议通信类"""
 
@@ -58,6 +94,9 @@ class SynScanProtocol:
         self.command_interval_ms = command_interval_ms
         self._last_command_time: float = 0.0
 
+        # 串口事务锁(监控线程与按钮I/O线程共用同一串口)
+        self._lock = threading.RLock()
+
         # 设置日志
         self.logger = logging.getLogger('SynScan')
         self.logger.setLevel(logging.DEBUG)
@@ -75,6 +114,17 @@ class SynScanProtocol:
         self.zero_ra_encoder: int = 0
         self.zero_dec_encoder: int = 0
 
+    def _enable_low_latency(self):
+        """尝试开启串口低延迟模式(Linux FTDI/CDC 适配器默认16ms延迟定时器会拖慢每次应答)，不支持时忽略"""
+        set_low_latency = getattr(self.serial, 'set_low_latency_mode', None)
+        if set_low_latency is None:
+            return
+        try:
+            set_low_latency(True)
+            self.logger.info("已开启串口低延迟模式")
+        except (OSError, ValueError, NotImplementedError) as e:
+            self.logger.debug(f"串口不支持低延迟模式: {e}")
+
     def connect(self) -> bool:
         """
         连接到串口设备
@@ -83,15 +133,22 @@ class SynScanProtocol:
             bool: 连接是否成功
         """
         try:
-            self.serial = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                timeout=self.timeout,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE
-            )
+            if self.serial is not None and not self.serial.is_open:
+                # 重连时复用已有的 Serial 对象，只更新端口后重新打开
+                self.serial.port = self.port
+                self.serial.baudrate = self.baudrate
+                self.serial.open()
+            else:
+                self.serial = serial.Serial(
+                    port=self.port,
+                    baudrate=self.baudrate,
+                    timeout=self.timeout,
+                    bytesize=serial.EIGHTBITS,
+                    parity=serial.PARITY_NONE,
+                    stopbits=serial.STOPBITS_ONE
+                )
             self.logger.info(f"已连接到 {self.port}, 波特率: {self.baudrate}")
+            self._enable_low_latency()
             time.sleep(0.5)  # 等待连接稳定
 
             # 在初始化轴之前，先下发时间(:T1)与位置(:Z1)
@@ -161,12 +218,32 @@ class SynScanProtocol:
             self.logger.error(f"连接失败: {e}")
             return False
 
+    @_locked
+    def reopen(self, port: str, baudrate: Optional[int] = None) -> bool:
+        """
+        断开后在同一实例上重新连接(可换端口)，保留观测地等已设置的状态
+
+        Args:
+            port: 串口名称
+            baudrate: 波特率(默认沿用当前值)
+
+        Returns:
+            bool: 连接是否成功
+        """
+        self.disconnect()
+        self.port = port
+        if baudrate is not None:
+            self.baudrate = baudrate
+        return self.connect()
+
+    @_locked
     def disconnect(self):
         """断开串口连接"""
         if self.serial and self.serial.is_open:
             self.serial.close()
             self.logger.info("已断开连接")
 
+    @_locked
     def send_command(self, axis: str, command: str, data: str = "") -> Optional[str]:
         """
         发送SynScan命令
@@ -184,19 +261,7 @@ class SynScanProtocol:
             return None
 
         try:
-            # 命令间隙节流（毫秒配置），避免连续发送过快
-            interval_ms = getattr(self, "command_interval_ms", 100)
-            if interval_ms and interval_ms > 0:
-                interval_s = interval_ms / 1000.0
-                last = getattr(self, "_last_command_time", 0.0)
-                if last > 0:
-                    now = time.time()
-                    delta = now - last
-                    if delta < interval_s:
-                        sleep_s = interval_s - delta
-                        if sleep_s > 0:
-                            self.logger.debug(f"命令间隙节流: sleep {sleep_s:.3f}s")
-                            time.sleep(sleep_s)
+            self._throttle()
 
             # 构建命令: :命令轴数据\r
             cmd = f":{command}{axis}{data}\r"
@@ -210,45 +275,99 @@ class SynScanProtocol:
             # 记录本次发送时间
             self._last_command_time = time.time()
 
-            # 读取响应 (格式: =数据\r 或 !\r)
-            response = ""
-            start_time = time.time()
+            return self._parse_response(self._read_response())
 
-            # 先读取第一个字符(应该是'='或'!')
-            while time.time() - start_time < self.timeout:
-                if self.serial.in_waiting > 0:
-                    char = self.serial.read(1).decode('ascii')
-                    response += char
-                    if char in ['=', '!']:
-                        # 找到开始符,继续读取数据直到\r
-                        while time.time() - start_time < self.timeout:
-                            if self.serial.in_waiting > 0:
-                                char = self.serial.read(1).decode('ascii')
-                                response += char
-                                if char == '\r':
-                                    break
-                            else:
-                                time.sleep(0.01)
-                        break
-                else:
-                    time.sleep(0.01)
+        except Exception as e:
+            self.logger.error(f"发送命令失败: {e}")
+            return None
 
-            self.logger.debug(f"收到响应: {repr(response)}")
+    @_locked
+    def send_commands_batch(self, commands: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+        """
+        批量发送SynScan命令(整组在同一把锁内完成, 不被其他线程插入命令)
 
-            # 检查响应
-            if response.startswith('='):
-                # 提取数据部分 (去掉开头的'='和结尾的'\r')
-                data = response[1:].rstrip('\r\n')
-                return data
-            elif response.startswith('!'):
-                self.logger.warning(f"命令错误: {response}")
-                return None
-            else:
-                self.logger.warning(f"响应超时或格式错误: {response}")
-                return None
+        配置了命令间隙(command_interval_ms > 0)时逐条节流发送; 仅当间隙为0时才一次写入全部命令帧
+        再依次读取响应——该方式依赖控制器在回复前一帧时缓存后续帧, 尚未在实机上验证。
+
+        Args:
+            commands: [(轴, 命令字符, 数据), ...]
+
+        Returns:
+            与 commands 一一对应的响应列表, 失败项为None
+        """
+        if not self.serial or not self.serial.is_open:
+            self.logger.error("串口未连接")
+            return [None] * len(commands)
+
+        if (getattr(self, "command_interval_ms", 100) or 0) > 0:
+            return [self.send_command(axis, command, data) for axis, command, data in commands]
+
+        try:
+            frames = "".join(f":{command}{axis}{data}\r" for axis, command, data in commands)
+            self.logger.debug(f"批量发送命令: {repr(frames)}")
+
+            self.serial.reset_input_buffer()
+            self.serial.write(frames.encode('ascii'))
+            self._last_command_time = time.time()
+
+            return [self._parse_response(self._read_response()) for _ in commands]
 
         except Exception as e:
-            self.logger.error(f"发送命令失败: {e}")
+            self.logger.error(f"批量发送命令失败: {e}")
+            return [None] * len(commands)
+
+    def _throttle(self):
+        """命令间隙节流（毫秒配置），避免连续发送过快"""
+        interval_ms = getattr(self, "command_interval_ms", 100)
+        if interval_ms and interval_ms > 0:
+            interval_s = interval_ms / 1000.0
+            last = getattr(self, "_last_command_time", 0.0)
+            if last > 0:
+                now = time.time()
+                delta = now - last
+                if delta < interval_s:
+                    sleep_s = interval_s - delta
+                    if sleep_s > 0:
+                        self.logger.debug(f"命令间隙节流: sleep {sleep_s:.3f}s")
+                        time.sleep(sleep_s)
+
+    def _read_response(self) -> str:
+        """读取一帧响应 (格式: =数据\r 或 !\r)，超时返回已读到的内容"""
+        response = ""
+        start_time = time.time()
+
+        # 先读取第一个字符(应该是'='或'!')
+        while time.time() - start_time < self.timeout:
+            if self.serial.in_waiting > 0:
+                char = self.serial.read(1).decode('ascii')
+                response += char
+                if char in ['=', '!']:
+                    # 找到开始符,继续读取数据直到\r
+                    while time.time() - start_time < self.timeout:
+                        if self.serial.in_waiting > 0:
+                            char = self.serial.read(1).decode('ascii')
+                            response += char
+                            if char == '\r':
+                                break
+                        else:
+                            time.sleep(0.01)
+                    break
+            else:
+                time.sleep(0.01)
+
+        self.logger.debug(f"收到响应: {repr(response)}")
+        return response
+
+    def _parse_response(self, response: str) -> Optional[str]:
+        """检查响应帧，成功返回数据部分，失败返回None"""
+        if response.startswith('='):
+            # 提取数据部分 (去掉开头的'='和结尾的'\r')
+            return response[1:].rstrip('\r\n')
+        elif response.startswith('!'):
+            self.logger.warning(f"命令错误: {response}")
+            return None
+        else:
+            self.logger.warning(f"响应超时或格式错误: {response}")
             return None
 
     def parse_little_endian_hex(self, hex_str: str) -> int:
@@ -267,13 +386,9 @@ class SynScanProtocol:
         if len(hex_str) != 6:
             raise ValueError(f"Invalid hex string length: {len(hex_str)}, expected 6")
 
-        # 解析小端序: "00204E" -> 0x4E2000
-        low = int(hex_str[0:2], 16)      # 低字节
-        mid = int(hex_str[2:4], 16)      # 中字节
-        high = int(hex_str[4:6], 16)     # 高字节
+        # 解析小端序: "00204E" -> 0x4E2000 (非16进制字符时 fromhex 抛出 ValueError)
+        return int.from_bytes(bytes.fromhex(hex_str), 'little')
 
-        value = (high << 16) | (mid << 8) | low
-        return value
     def range24(self, h: float) -> float:
         """将小时数规范到[0,24)。"""
         return h % 24.0
@@ -309,12 +424,9 @@ class SynScanProtocol:
         使用与 altaz_to_radec 中相同的简化GMST/LST计算。
         若未设置经度，默认0。
         """
-        import math
-        from datetime import datetime, timezone
+        from datetime import timezone
         lon_deg = self.longitude if self.longitude is not None else 0.0
-        now = datetime.now(timezone.utc)
-        jd = 2451545.0 + (now - datetime(2000, 1, 1, 12, 0, 0, tzinfo=timezone.utc)).total_seconds() / 86400.0
-        gmst = (280.46061837 + 360.98564736629 * (jd - 2451545.0)) % 360.0
+        gmst = gmst_deg(datetime.now(timezone.utc))
         lst_deg = (gmst + lon_deg) % 360.0
         lst_hours = lst_deg / 15.0
         self.logger.debug(f"LST计算: 经度={lon_deg:.4f}°, GMST={gmst:.6f}°, LST={lst_deg:.6f}° -> {lst_hours:.6f}h")
@@ -356,7 +468,10 @@ class SynScanProtocol:
         Returns:
             角度(度)。RA归一为[0,360)，DEC限制在[-90,90]；失败返回None。
         """
-        resp = self.send_command(axis, 'j')
+        return self._parse_axis_degree(axis, self.send_command(axis, 'j'))
+
+    def _parse_axis_degree(self, axis: str, resp: Optional[str]) -> Optional[float]:
+        """解析 j1/j2 响应为角度(度)，无法解析返回None"""
         if resp is None:
             return None
         s = resp.strip()
@@ -374,33 +489,38 @@ class SynScanProtocol:
             # 非十进制度格式(可能是旧固件6位HEX)，交由兼容路径处理
             return None
 
-    def get_ra_dec(self) -> Optional[Tuple[float, float]]:
+    def get_ra_dec(self) -> Tuple[float, float]:
         """
         获取当前RA/DEC位置(度)
 
         仅使用新固件 j1/j2 直接返回的十进制度。
-        读取失败时返回 None（不再使用编码器步进回退逻辑）。
+        读取失败时抛出 MountReadError，附带本次两轴的原始响应，调用方无需再次读取。
 
         Returns:
-            (RA, DEC) 元组,单位为度,失败返回None
+            (RA, DEC) 元组,单位为度
             RA: 0-360°
             DEC: -90到+90°
+
+        Raises:
+            MountReadError: 任一轴读取或解析失败
         """
         # 尝试新固件直读
-        ra_deg = self.get_axis_degree(self.AXIS_RA)
-        dec_deg = self.get_axis_degree(self.AXIS_DEC)
+        ra_resp = self.send_command(self.AXIS_RA, 'j')
+        dec_resp = self.send_command(self.AXIS_DEC, 'j')
+        ra_deg = self._parse_axis_degree(self.AXIS_RA, ra_resp)
+        dec_deg = self._parse_axis_degree(self.AXIS_DEC, dec_resp)
         if ra_deg is not None and dec_deg is not None:
             self.current_ra = ra_deg
             self.current_dec = dec_deg
             self.logger.info(f"坐标(j直读): RA={ra_deg:.6f}°, DEC={dec_deg:.6f}°")
             return (ra_deg, dec_deg)
 
-        # 若直读失败则直接返回None（不再使用编码器回退逻辑）
+        # 若直读失败则抛出异常（不再使用编码器回退逻辑）
         if ra_deg is None:
             self.logger.error("获取RA坐标失败(j直读)")
         if dec_deg is None:
             self.logger.error("获取DEC坐标失败(j直读)")
-        return None
+        raise MountReadError(ra_resp, dec_resp)
 
     def get_version(self) -> Optional[str]:
         """
@@ -422,7 +542,7 @@ class SynScanProtocol:
         self.send_command(axis, 'K')
 
     def stop_all(self):
-        """停止所有轴"""
+        """停止所有轴(逐条发送K命令；停止路径不依赖未经实机验证的批量写入)"""
         self.stop(self.AXIS_RA)
         self.stop(self.AXIS_DEC)
 
@@ -499,6 +619,7 @@ class SynScanProtocol:
             self.logger.error(f"设置跟踪模式失败: {mode}")
             return False
 
+    @_locked
     def goto_ra_dec(self, ra_deg: float, dec_deg: float) -> bool:
         """
         GOTO到指定的RA/DEC位置（使用 :X1 指令，RA=小时小数, DEC=度小数）
@@ -634,6 +755,7 @@ class SynScanProtocol:
             self.logger.error(f"✗ SlewToCoordinates时出错: {e}")
             return False
 
+    @_locked
     def set_time(self, year: int, month: int, day: int,
                  hour: int, minute: int, second: int, timezone: int) -> bool:
         """
@@ -693,6 +815,7 @@ class SynScanProtocol:
             self.logger.error(f"✗ 设置时间时出错: {e}")
             return False
 
+    @_locked
     def initialize_axis(self, axis: int) -> bool:
         """
         初始化轴
@@ -769,6 +892,7 @@ class SynScanProtocol:
         self.logger.info("✓ 赤道仪初始化完成")
         return True
 
+    @_locked
     def set_location(self, latitude: float, longitude: float, elevation: int = 0) -> bool:
         """
         设置观测位置
@@ -851,29 +975,22 @@ class SynScanProtocol:
         alt_rad = math.radians(alt_deg)
         lat_rad = math.radians(lat_deg)
 
+        # 地平 -> 赤道(时角)是绕东西轴的一次旋转，直接由旋转后的方向分量求角度：
+        # 各三角函数只算一次，atan2 自带时角符号(东边为负)，无需 acos 截断
+        sin_alt, cos_alt = math.sin(alt_rad), math.cos(alt_rad)
+        sin_az, cos_az = math.sin(az_rad), math.cos(az_rad)
+        sin_lat, cos_lat = math.sin(lat_rad), math.cos(lat_rad)
+
         # 计算赤纬 (DEC)
-        sin_dec = math.sin(alt_rad) * math.sin(lat_rad) + \
-                  math.cos(alt_rad) * math.cos(lat_rad) * math.cos(az_rad)
-        dec_rad = math.asin(sin_dec)
-        dec_deg = math.degrees(dec_rad)
+        sin_dec = sin_alt * sin_lat + cos_alt * cos_lat * cos_az
+        dec_deg = math.degrees(math.asin(max(-1.0, min(1.0, sin_dec))))
 
         # 计算时角 (Hour Angle)
-        cos_ha = (math.sin(alt_rad) - math.sin(lat_rad) * math.sin(dec_rad)) / \
-                 (math.cos(lat_rad) * math.cos(dec_rad))
-        cos_ha = max(-1.0, min(1.0, cos_ha))  # 限制在[-1, 1]
-        ha_rad = math.acos(cos_ha)
-
-        # 根据方位角确定时角的符号
-        if math.sin(az_rad) > 0:  # 东边
-            ha_rad = -ha_rad
-
-        ha_deg = math.degrees(ha_rad)
-
-        # 计算当前恒星时 (简化计算)
-        now = datetime.now(timezone.utc)
-        jd = 2451545.0 + (now - datetime(2000, 1, 1, 12, 0, 0, tzinfo=timezone.utc)).total_seconds() / 86400.0
-        gmst = (280.46061837 + 360.98564736629 * (jd - 2451545.0)) % 360.0
-        lst = (gmst + lon_deg) % 360.0
+        ha_deg = math.degrees(math.atan2(-sin_az * cos_alt,
+                                         sin_alt * cos_lat - cos_alt * cos_az * sin_lat))
+
+        # 计算当前恒星时
+        lst = (gmst_deg(datetime.now(timezone.utc)) + lon_deg) % 360.0
 
         # 计算赤经 (RA)
         ra_deg = (lst - ha_deg) % 360.0
@@ -7,23 +7,94 @@ SkyWatcher 设备监控UI
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+import tkinter.font as tkfont
 import threading
+import queue
+import concurrent.futures
+import functools
 import time
+from collections import deque
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 import logging
 import re
-import random
+import sys
 
 import math
 
+import numpy as np
+import serial
 from serial.tools import list_ports
 from config import load_config, save_config
+from synscan import MountReadError, gmst_deg
+
+# 常用颜色(十六进制值，免去Tk颜色名解析)
+_RED = "#FF0000"
+_GREEN = "#008000"
+_BLUE = "#0000FF"
+_GRAY = "#808080"
+
+# GPS 文本: "40.0°N,120.0°E" / "40.0N,120.0E" / "+40.0,-120.0"
+_GPS_RE = re.compile(r'^([+\-]?\d+(?:\.\d+)?)°?([NSns])?,?([+\-]?\d+(?:\.\d+)?)°?([EWew])?$')
+
+
+def _set_if_changed(var: tk.StringVar, text: str):
+    """仅当文本变化时写入变量，避免触发多余的 trace 回调"""
+    if var.get() != text:
+        var.set(text)
+
+
+class SecondCachedFormatter(logging.Formatter):
+    """时间戳按秒缓存的Formatter，同一秒内的多条日志复用格式化结果"""
+
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._ts_cache_sec = -1
+        self._ts_cache_str = ""
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._ts_cache_sec:
+            self._ts_cache_sec = sec
+            self._ts_cache_str = time.strftime(datefmt or self.datefmt or "%H:%M:%S",
+                                               self.converter(sec))
+        return self._ts_cache_str
+
+
+class TkTextHandler(logging.Handler):
+    """将日志记录写入UI日志区的Handler(可在任意线程调用)"""
+
+    def __init__(self, ui: "SkyWatcherUI", level=logging.NOTSET):
+        super().__init__(level)
+        self.ui = ui
+        self.setFormatter(SecondCachedFormatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S"))
+
+    def emit(self, record):
+        try:
+            self.ui._append_log(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
 
 
 class SkyWatcherUI:
     """SkyWatcher设备监控UI"""
 
+    # 日志区最多保留的行数；超出 _LOG_TRIM_SLACK 行后才裁剪一次，避免每批都删除
+    _LOG_MAX = 2000
+    _LOG_TRIM_SLACK = 200
+
+    # 速度值校验: 完整6位16进制 / 输入过程中最多6位16进制
+    _HEX6 = re.compile(r'[0-9A-Fa-f]{6}').fullmatch
+    _HEX_PARTIAL = re.compile(r'[0-9A-Fa-f]{0,6}').fullmatch
+
+    # 坐标输入框按键校验(允许输入过程中的不完整值，如 "", "-", "12.")
+    _NUM_PARTIAL = re.compile(r'[+\-]?\d*\.?\d*').fullmatch
+    _UNUM_PARTIAL = re.compile(r'\d*\.?\d*').fullmatch
+    _UINT2_PARTIAL = re.compile(r'\d{0,2}').fullmatch
+
+    # 00-99 两位数字符串查表，坐标格式化时避免逐次整数格式化
+    _DD = tuple(f"{i:02d}" for i in range(100))
+
     def __init__(self, synscan=None, stellarium_sync=None):
         """
         初始化UI
@@ -34,32 +105,108 @@ class SkyWatcherUI:
         """
         self.synscan = synscan
         self.stellarium_sync = stellarium_sync
+        self._bind_direction_fns()
 
         # 创建主窗口
         self.root = tk.Tk()
         self.root.title("SkyWatcher 设备监控")
-        self.root.geometry("900x900")  # 增加高度,让手控板能被看到
+        # 创建控件期间先隐藏窗口，避免逐个添加控件时反复重排/重绘
+        self.root.withdraw()
         self.root.resizable(True, True)
 
         # 运行状态
         self.running = False
-        self.update_thread = None
+        # 常驻监控线程：_go 置位时轮询设备，清除后挂起等待；_shutdown 用于退出
+        # _stop_evt 用于打断轮询间隔的等待，停止/退出时无需等满1秒
+        self._go = threading.Event()
+        self._shutdown = threading.Event()
+        self._stop_evt = threading.Event()
+        self.update_thread = threading.Thread(target=self._worker_main, daemon=True)
+        self.update_thread.start()
+        # 监控线程产出的样本 (时间戳, 位置, 消息)，由 _drain() 在Tk主线程中消费
+        self.sample_q = queue.Queue(maxsize=4)
+        self._after_id = None
+        self._drain_id = None
         # 随机GOTO状态
         self.random_goto_running = False
-        self.random_goto_thread = None
+        self._rg_after_id = None
 
         # 当前位置 (从实时监控获取)
         self.current_ra = None
         self.current_dec = None
 
-        # 设置日志
+        # 上次显示的坐标文本 (RA, DEC, RA度, DEC度)
+        self._last_pos_text = (None, None, None, None)
+
+        # 位置日志合并：记录上次写日志时的位置/时间与连续失败次数
+        self._last_logged_ra = None
+        self._last_logged_dec = None
+        self._last_log_t = 0.0
+        self._fail_count = 0
+
+        # 监控错误限流：相同错误5秒内只输出一次
+        self._last_err = None
+        self._last_err_ts = 0.0
+
+        # 设置日志: 经TkTextHandler只写入日志区(控制台输出由各处自行决定，不向根logger传播)；
+        # 级别沿用根logger(main.py 的 --debug)。移除之前实例遗留的Handler，避免重复写入已销毁的控件
         self.logger = logging.getLogger('SkyWatcherUI')
+        self.logger.propagate = False
+        for h in [h for h in self.logger.handlers if isinstance(h, TkTextHandler)]:
+            self.logger.removeHandler(h)
+        self._log_handler = TkTextHandler(self)
+
+        # Stellarium同步队列与线程：只关心最新位置，避免网络阻塞拖慢串口轮询
+        self._stellarium_q = queue.SimpleQueue()
+        self._stellarium_thread = threading.Thread(target=self._stellarium_worker, daemon=True)
+        self._stellarium_thread.start()
+
+        # 日志缓冲(环形，最多 _LOG_MAX 条)：合并写入日志区，并限制总行数
+        self._log_buf = deque(maxlen=self._LOG_MAX)
+        self._log_flush_pending = False
+
+        # 按钮触发的设备I/O(串口/Stellarium)统一交给单线程执行器，保持命令顺序且不阻塞Tk主线程
+        self._io = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="synscan-io")
+        # Stellarium HTTP请求走独立执行器，与串口命令并行，互不排队
+        self._net = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="stellarium-io")
+        self._sel_fetch_pending = False
+
+        # 后台线程 -> Tk主线程 的调用队列 (fn, args)，由 _pump_ui_calls() 定期执行
+        self._ui_thread = threading.current_thread()
+        self._ui_calls = queue.SimpleQueue()
+        self.logger.addHandler(self._log_handler)
 
         # 创建UI组件
         self.create_widgets()
+        # 控件全部创建后再设定窗口尺寸并显示，只做一次布局
+        self.root.geometry("900x900")  # 增加高度,让手控板能被看到
+        self.root.deiconify()
+        self._pump_ui_calls()
+        # 时钟与监控状态无关，始终按整秒刷新
+        self.tick()
 
     def create_widgets(self):
         """创建UI组件"""
+        # 共享字体与样式：各控件引用同一Font对象，避免逐个传字体元组
+        self._font_big = tkfont.Font(root=self.root, family="Courier", size=14, weight="bold")
+        self._font_med = tkfont.Font(root=self.root, family="Courier", size=12)
+        self._font_sm = tkfont.Font(root=self.root, family="Courier", size=10)
+        self._font_log = tkfont.Font(root=self.root, family="Courier", size=9)
+        self._font_hint = tkfont.Font(root=self.root, family="Arial", size=8)
+        # 强调按钮: 在Tk默认字体基础上加粗
+        self._font_accent = tkfont.nametofont("TkDefaultFont").copy()
+        self._font_accent.configure(weight="bold")
+        self._style = ttk.Style(self.root)
+        self._style.configure("Mono.TLabel", font=self._font_med)
+        self._style.configure("MonoSmall.TLabel", font=self._font_sm)
+        self._style.configure("Coord.TLabel", font=self._font_big, foreground=_BLUE)
+        self._style.configure("Red.TLabel", foreground=_RED)
+        self._style.configure("Green.TLabel", foreground=_GREEN)
+        self._style.configure("Hint.TLabel", foreground=_GRAY, font=self._font_hint)
+        self._style.configure("Accent.TButton", font=self._font_accent)
+        self._style.configure("Invalid.TEntry", foreground=_RED)
+        self._style.configure("Quick.TButton", padding=1)
+
         # 主框架
         # 顶部Notebook，分为“控制”和“日志”两个页面
         self.notebook = ttk.Notebook(self.root)
@@ -85,56 +232,17 @@ class SkyWatcherUI:
             "英国": (51.5, -0.1),
         }
 
-        loc_frame = ttk.LabelFrame(env_tab, text="地点预设", padding=10)
-        loc_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=6)
-        loc_frame.columnconfigure(1, weight=1)
-
-        ttk.Label(loc_frame, text="地点:").grid(row=0, column=0, sticky=tk.W)
+        # 地点/时间页的变量先创建(供其他方法读取)，控件在首次切换到该页时再构建
         self.env_loc_var = tk.StringVar(value="北京")
-        self.env_loc_combo = ttk.Combobox(loc_frame, textvariable=self.env_loc_var, width=20, state="readonly",
-                                          values=list(self._preset_locations.keys()))
-        self.env_loc_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=6)
-        self.env_loc_combo.current(list(self._preset_locations.keys()).index("北京"))
-
-        self.env_loc_info = ttk.Label(loc_frame, text="lat=39.9, lon=116.4")
-        self.env_loc_info.grid(row=0, column=2, sticky=tk.W, padx=6)
-
-        def _on_loc_change(event=None):
-            name = self.env_loc_var.get()
-            lat, lon = self._preset_locations.get(name, (0.0, 0.0))
-            self.env_loc_info.config(text=f"lat={lat:.2f}, lon={lon:.2f}")
-        self.env_loc_combo.bind("<<ComboboxSelected>>", _on_loc_change)
-
-        ttk.Button(loc_frame, text="应用地点(设备+Stellarium)", command=self.apply_location_to_both).grid(row=0, column=3, padx=8)
-
-        # 时间与时区
-        time_frame = ttk.LabelFrame(env_tab, text="时间/时区", padding=10)
-        time_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=6)
-        time_frame.columnconfigure(5, weight=1)
-
-        ttk.Label(time_frame, text="时间预设:").grid(row=0, column=0, sticky=tk.W)
+        self._env_loc_info_var = tk.StringVar(value="lat=39.90, lon=116.40")
+        self.env_loc_var.trace_add("write", self._on_env_loc_changed)
         self.env_time_preset_var = tk.StringVar(value="当前时间")
-        self.env_time_combo = ttk.Combobox(time_frame, textvariable=self.env_time_preset_var, width=12, state="readonly",
-                                           values=["当前时间", "春分", "夏至", "秋分", "冬至"])
-        self.env_time_combo.grid(row=0, column=1, padx=6, sticky=tk.W)
-
-        ttk.Label(time_frame, text="时区(UTC±小时):").grid(row=0, column=2, sticky=tk.W, padx=(12, 0))
         self.env_tz_var = tk.StringVar(value="8")
-        self.env_tz_combo = ttk.Combobox(time_frame, textvariable=self.env_tz_var, width=4, state="readonly",
-                                         values=[str(i) for i in range(-12, 15)])
-        self.env_tz_combo.grid(row=0, column=3, sticky=tk.W)
-
-        ttk.Button(time_frame, text="应用时间/时区(设备+Stellarium)", command=self.apply_time_to_both).grid(row=0, column=4, padx=8)
-
-        # 随机GOTO
-        rand_frame = ttk.LabelFrame(env_tab, text="随机GOTO", padding=10)
-        rand_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=6)
-
-        ttk.Label(rand_frame, text="数量(个):").grid(row=0, column=0, sticky=tk.W)
+        self._tz_hours = 8  # env_tz_var 的整数缓存，由 trace 更新，避免循环中反复跨Tcl读取
+        self.env_tz_var.trace_add("write", self._on_env_tz_changed)
         self.env_goto_count_var = tk.StringVar(value="10")
-        ttk.Spinbox(rand_frame, from_=1, to=999, textvariable=self.env_goto_count_var, width=6).grid(row=0, column=1, padx=6)
-        ttk.Button(rand_frame, text="开始随机GOTO", command=self.start_random_goto_sequence).grid(row=0, column=2, padx=8)
-        ttk.Button(rand_frame, text="停止", command=self.stop_random_goto_sequence).grid(row=0, column=3, padx=4)
+        self._env_tab = env_tab
+        self._env_tab_built = False
 
         log_tab = ttk.Frame(self.notebook)
         self.notebook.add(control_tab, text="控制")
@@ -149,6 +257,8 @@ class SkyWatcherUI:
         # 保存以便其他方法可访问日志页容器
         self._log_tab = log_tab
         self._control_tab = control_tab
+        # 日志页/地点时间页按需构建
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # 配置网格权重
         self.root.columnconfigure(0, weight=1)
@@ -174,12 +284,16 @@ class SkyWatcherUI:
 
         # 串口状态
         ttk.Label(status_frame, text="串口:").grid(row=0, column=0, sticky=tk.W)
-        self.serial_status = ttk.Label(status_frame, text="未连接", foreground="red")
+        self._serial_status_var = tk.StringVar(value="未连接")
+        self.serial_status = ttk.Label(status_frame, textvariable=self._serial_status_var, style="Red.TLabel")
         self.serial_status.grid(row=0, column=1, sticky=tk.W, padx=10)
 
         # Stellarium状态
         ttk.Label(status_frame, text="Stellarium:").grid(row=0, column=2, sticky=tk.W, padx=20)
-        self.stellarium_status = ttk.Label(status_frame, text="未连接", foreground="red")
+        self._stellarium_status_var = tk.StringVar(value="未连接")
+        # 上次显示的 (串口, Stellarium) 连接状态，未变化时 update_status 直接返回
+        self._last_status = (False, False)
+        self.stellarium_status = ttk.Label(status_frame, textvariable=self._stellarium_status_var, style="Red.TLabel")
         self.stellarium_status.grid(row=0, column=3, sticky=tk.W, padx=10)
 
         # 串口选择/连接行
@@ -222,7 +336,8 @@ class SkyWatcherUI:
                 pass
         self.cmd_interval_var.set(str(saved_cmd_interval))
 
-        self.refresh_serial_ports(pref_port=saved_port)
+        # 串口枚举较慢(Windows上可达数百毫秒)，等主循环空闲后在后台线程执行，不阻塞首次绘制
+        self.root.after_idle(self.refresh_serial_ports, saved_port)
 
 
         # === 设备信息区域 ===
@@ -233,12 +348,20 @@ class SkyWatcherUI:
 
         # 系统时间
         ttk.Label(info_frame, text="系统时间:").grid(row=0, column=0, sticky=tk.W)
-        self.time_label = ttk.Label(info_frame, text="--:--:--", font=("Courier", 12))
+        self._time_var = tk.StringVar(value="--:--:--")
+        self._last_ymd = None
+        self._last_ymd_str = ""
+        self.time_label = ttk.Label(info_frame, textvariable=self._time_var, style="Mono.TLabel")
         self.time_label.grid(row=0, column=1, sticky=tk.W, padx=10)
 
         # GPS位置 (模拟)
         ttk.Label(info_frame, text="GPS位置:").grid(row=0, column=2, sticky=tk.W, padx=20)
-        self.gps_label = ttk.Label(info_frame, text="39.9164°N, 116.3830°E", font=("Courier", 10))
+        self._gps_var = tk.StringVar(value="39.9164°N, 116.3830°E")
+        self.gps_label = ttk.Label(info_frame, textvariable=self._gps_var, style="MonoSmall.TLabel")
+        # GPS文本变化时解析一次并缓存 (lat, lon)
+        self._gps_deg = None
+        self._gps_var.trace_add("write", self._on_gps_changed)
+        self._on_gps_changed()
         self.gps_label.grid(row=0, column=3, sticky=tk.W, padx=10)
 
         # === 望远镜坐标区域 ===
@@ -249,37 +372,48 @@ class SkyWatcherUI:
 
         # RA (赤经)
         ttk.Label(coord_frame, text="赤经 (RA):").grid(row=0, column=0, sticky=tk.W)
-        self.ra_label = ttk.Label(coord_frame, text="--h--m--s", font=("Courier", 14, "bold"), foreground="blue")
+        self._ra_var = tk.StringVar(value="--h--m--s")
+        self.ra_label = ttk.Label(coord_frame, textvariable=self._ra_var, style="Coord.TLabel")
         self.ra_label.grid(row=0, column=1, sticky=tk.W, padx=10)
 
         # DEC (赤纬)
         ttk.Label(coord_frame, text="赤纬 (DEC):").grid(row=0, column=2, sticky=tk.W, padx=20)
-        self.dec_label = ttk.Label(coord_frame, text="--°--'--\"", font=("Courier", 14, "bold"), foreground="blue")
+        self._dec_var = tk.StringVar(value="--°--'--\"")
+        self.dec_label = ttk.Label(coord_frame, textvariable=self._dec_var, style="Coord.TLabel")
         self.dec_label.grid(row=0, column=3, sticky=tk.W, padx=10)
 
         # RA (度)
         ttk.Label(coord_frame, text="RA (度):").grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.ra_deg_label = ttk.Label(coord_frame, text="---°", font=("Courier", 10))
+        self._ra_deg_var = tk.StringVar(value="---°")
+        self.ra_deg_label = ttk.Label(coord_frame, textvariable=self._ra_deg_var, style="MonoSmall.TLabel")
         self.ra_deg_label.grid(row=1, column=1, sticky=tk.W, padx=10)
 
         # DEC (度)
         ttk.Label(coord_frame, text="DEC (度):").grid(row=1, column=2, sticky=tk.W, padx=20)
-        self.dec_deg_label = ttk.Label(coord_frame, text="---°", font=("Courier", 10))
+        self._dec_deg_var = tk.StringVar(value="---°")
+        self.dec_deg_label = ttk.Label(coord_frame, textvariable=self._dec_deg_var, style="MonoSmall.TLabel")
         self.dec_deg_label.grid(row=1, column=3, sticky=tk.W, padx=10)
 
         # === GOTO控制区域 ===
         goto_frame = ttk.LabelFrame(main_frame, text="GOTO控制", padding="6")
         goto_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=5)
 
+        # 坐标输入框按键校验：拒绝非数字字符，避免联动解析时反复走异常路径
+        vnum = (self.root.register(self._vnum), "%P")
+        vunum = (self.root.register(self._vunum), "%P")
+        vuint2 = (self.root.register(self._vuint2), "%P")
+
         # 第一行：RA/DEC(度) + GOTO按钮
         ttk.Label(goto_frame, text="RA (度):").grid(row=0, column=0, sticky=tk.W)
         self.goto_ra_var = tk.StringVar(value="0.0")
-        self.goto_ra_entry = ttk.Entry(goto_frame, width=8, textvariable=self.goto_ra_var)
+        self.goto_ra_entry = ttk.Entry(goto_frame, width=8, textvariable=self.goto_ra_var,
+                                       validate="key", validatecommand=vnum)
         self.goto_ra_entry.grid(row=0, column=1, padx=2, pady=2)
 
         ttk.Label(goto_frame, text="DEC (度):").grid(row=0, column=2, sticky=tk.W)
         self.goto_dec_var = tk.StringVar(value="0.0")
-        self.goto_dec_entry = ttk.Entry(goto_frame, width=8, textvariable=self.goto_dec_var)
+        self.goto_dec_entry = ttk.Entry(goto_frame, width=8, textvariable=self.goto_dec_var,
+                                        validate="key", validatecommand=vnum)
         self.goto_dec_entry.grid(row=0, column=3, padx=2, pady=2)
 
         ttk.Button(goto_frame, text="GOTO (X1)", command=self.goto_radec).grid(row=0, column=4, padx=2, pady=2)
@@ -292,42 +426,49 @@ class SkyWatcherUI:
         self.goto_ra_s_var = tk.StringVar(value="0")
         ra_hms_frame = ttk.Frame(goto_frame)
         ra_hms_frame.grid(row=1, column=1, sticky=tk.W)
-        ttk.Entry(ra_hms_frame, width=2, textvariable=self.goto_ra_h_var).pack(side=tk.LEFT)
+        ttk.Entry(ra_hms_frame, width=2, textvariable=self.goto_ra_h_var,
+                  validate="key", validatecommand=vuint2).pack(side=tk.LEFT)
         ttk.Label(ra_hms_frame, text=":").pack(side=tk.LEFT, padx=(1, 1))
-        ttk.Entry(ra_hms_frame, width=2, textvariable=self.goto_ra_m_var).pack(side=tk.LEFT)
+        ttk.Entry(ra_hms_frame, width=2, textvariable=self.goto_ra_m_var,
+                  validate="key", validatecommand=vuint2).pack(side=tk.LEFT)
         ttk.Label(ra_hms_frame, text=":").pack(side=tk.LEFT, padx=(1, 1))
-        ttk.Entry(ra_hms_frame, width=4, textvariable=self.goto_ra_s_var).pack(side=tk.LEFT)
+        ttk.Entry(ra_hms_frame, width=4, textvariable=self.goto_ra_s_var,
+                  validate="key", validatecommand=vunum).pack(side=tk.LEFT)
 
         ttk.Label(goto_frame, text="DEC(°):").grid(row=1, column=2, sticky=tk.W)
         self.goto_dec2_var = tk.StringVar(value="0.0")
-        self.goto_dec2_entry = ttk.Entry(goto_frame, width=8, textvariable=self.goto_dec2_var)
+        self.goto_dec2_entry = ttk.Entry(goto_frame, width=8, textvariable=self.goto_dec2_var,
+                                         validate="key", validatecommand=vnum)
         self.goto_dec2_entry.grid(row=1, column=3, padx=2)
 
         # 第三行：地平坐标与按钮
         ttk.Label(goto_frame, text="方位角:").grid(row=2, column=0, sticky=tk.W, pady=(6, 0))
-        self.goto_az_entry = ttk.Entry(goto_frame, width=6)
+        self.goto_az_var = tk.StringVar(value="0")
+        self.goto_az_entry = ttk.Entry(goto_frame, width=6, textvariable=self.goto_az_var,
+                                       validate="key", validatecommand=vnum)
         self.goto_az_entry.grid(row=2, column=1, padx=2)
-        self.goto_az_entry.insert(0, "0")
 
         ttk.Label(goto_frame, text="高度角:").grid(row=2, column=2, sticky=tk.W)
-        self.goto_alt_entry = ttk.Entry(goto_frame, width=6)
+        self.goto_alt_var = tk.StringVar(value="30")
+        self.goto_alt_entry = ttk.Entry(goto_frame, width=6, textvariable=self.goto_alt_var,
+                                        validate="key", validatecommand=vnum)
         self.goto_alt_entry.grid(row=2, column=3, padx=2)
-        self.goto_alt_entry.insert(0, "30")
 
         ttk.Button(goto_frame, text="GOTO (Az/Alt)", command=self.goto_altaz).grid(row=2, column=4, padx=2)
 
         # 绑定联动逻辑
         self._suppress_ra_sync = False
         self._suppress_dec_sync = False
+        self._sync_after = {}
         # RA 度 -> RA 时分秒
-        self.goto_ra_var.trace_add("write", lambda *args: self._on_ra_deg_changed())
+        self.goto_ra_var.trace_add("write", self._on_ra_deg_changed)
         # RA 时分秒 -> RA 度
-        self.goto_ra_h_var.trace_add("write", lambda *args: self._on_ra_hms_changed())
-        self.goto_ra_m_var.trace_add("write", lambda *args: self._on_ra_hms_changed())
-        self.goto_ra_s_var.trace_add("write", lambda *args: self._on_ra_hms_changed())
+        self.goto_ra_h_var.trace_add("write", self._on_ra_hms_changed)
+        self.goto_ra_m_var.trace_add("write", self._on_ra_hms_changed)
+        self.goto_ra_s_var.trace_add("write", self._on_ra_hms_changed)
         # DEC 镜像联动
-        self.goto_dec_var.trace_add("write", lambda *args: self._on_dec1_changed())
-        self.goto_dec2_var.trace_add("write", lambda *args: self._on_dec2_changed())
+        self.goto_dec_var.trace_add("write", self._on_dec1_changed)
+        self.goto_dec2_var.trace_add("write", self._on_dec2_changed)
 
         # 快速定位按钮
         quick_frame = ttk.Frame(goto_frame)
@@ -335,14 +476,14 @@ class SkyWatcherUI:
 
         ttk.Label(quick_frame, text="快速定位:").grid(row=0, column=0, sticky=tk.W, padx=(0, 6))
 
-        ttk.Button(quick_frame, text="北方 (Az=0° Alt=10°)",
-                   command=lambda: self.quick_goto(0, 10)).grid(row=0, column=1, padx=2)
-
-        ttk.Button(quick_frame, text="西方 (Az=260° Alt=30°)",
-                   command=lambda: self.quick_goto(260, 30)).grid(row=0, column=2, padx=2)
-
-        ttk.Button(quick_frame, text="西北 (Az=290° Alt=60°)",
-                   command=lambda: self.quick_goto(290, 60)).grid(row=0, column=3, padx=2)
+        # (文本, 方位角, 高度角, 列)
+        for text, az, alt, col in (
+            ("北方 (Az=0° Alt=10°)", 0, 10, 1),
+            ("西方 (Az=260° Alt=30°)", 260, 30, 2),
+            ("西北 (Az=290° Alt=60°)", 290, 60, 3),
+        ):
+            ttk.Button(quick_frame, text=text, style="Quick.TButton",
+                       command=functools.partial(self.quick_goto, az, alt)).grid(row=0, column=col, padx=2)
 
         # 清除Stellarium绘制按钮
         ttk.Button(quick_frame, text="🗑️ 清除Stellarium绘制",
@@ -354,30 +495,24 @@ class SkyWatcherUI:
         ttk.Label(quick_frame, text="均匀12点 Alt(°):").grid(row=1, column=0, sticky=tk.W, padx=(0, 4))
         ttk.Entry(quick_frame, width=4, textvariable=self.quick_uniform_alt_var).grid(row=1, column=1, padx=(0, 6))
 
-        # 第一行 0°~150°
-        angles1 = [0, 30, 60, 90, 120, 150]
-        for i, az in enumerate(angles1):
-            ttk.Button(quick_frame, text=f"{az}°", width=5,
-                       command=lambda a=az: self.quick_uniform_goto(a)).grid(row=1, column=2 + i, padx=2, pady=2)
-
-        # 第二行 180°~330°
-        angles2 = [180, 210, 240, 270, 300, 330]
-        for i, az in enumerate(angles2):
-            ttk.Button(quick_frame, text=f"{az}°", width=5,
-                       command=lambda a=az: self.quick_uniform_goto(a)).grid(row=2, column=2 + i, padx=2, pady=2)
+        # 第一行 0°~150°，第二行 180°~330°
+        for i, az in enumerate(range(0, 360, 30)):
+            row, col = divmod(i, 6)
+            ttk.Button(quick_frame, text=f"{az}°", width=5, style="Quick.TButton",
+                       command=functools.partial(self.quick_uniform_goto, az)).grid(row=1 + row, column=2 + col, padx=2, pady=2)
 
         # 30°高度四向 + 天顶
         ttk.Label(quick_frame, text="30°高度与天顶:").grid(row=3, column=0, sticky=tk.W, padx=(0, 4))
-        ttk.Button(quick_frame, text="北(0/30)", width=8,
-                   command=lambda: self.quick_goto(0, 30)).grid(row=3, column=1, padx=2, pady=2)
-        ttk.Button(quick_frame, text="东(90/30)", width=8,
-                   command=lambda: self.quick_goto(90, 30)).grid(row=3, column=2, padx=2, pady=2)
-        ttk.Button(quick_frame, text="南(180/30)", width=9,
-                   command=lambda: self.quick_goto(180, 30)).grid(row=3, column=3, padx=2, pady=2)
-        ttk.Button(quick_frame, text="西(270/30)", width=9,
-                   command=lambda: self.quick_goto(270, 30)).grid(row=3, column=4, padx=2, pady=2)
-        ttk.Button(quick_frame, text="天顶", width=6,
-                   command=lambda: self.quick_goto(0, 90)).grid(row=3, column=5, padx=4, pady=2)
+        # (文本, 方位角, 高度角, 宽度, padx)
+        for col, (text, az, alt, width, padx) in enumerate((
+            ("北(0/30)", 0, 30, 8, 2),
+            ("东(90/30)", 90, 30, 8, 2),
+            ("南(180/30)", 180, 30, 9, 2),
+            ("西(270/30)", 270, 30, 9, 2),
+            ("天顶", 0, 90, 6, 4),
+        ), start=1):
+            ttk.Button(quick_frame, text=text, width=width, style="Quick.TButton",
+                       command=functools.partial(self.quick_goto, az, alt)).grid(row=3, column=col, padx=padx, pady=2)
 
 
         # === Stellarium 选中目标信息（靠左 + 自动刷新 + GOTO选中）===
@@ -397,45 +532,50 @@ class SkyWatcherUI:
 
         # 名称与坐标信息：两列竖排，全部靠左
         ttk.Label(selected_frame, text="名称:").grid(row=1, column=0, sticky=tk.W)
-        self.sel_name_val = ttk.Label(selected_frame, text="—", anchor=tk.W)
+        self._sel_name_var = tk.StringVar(value="—")
+        self.sel_name_val = ttk.Label(selected_frame, textvariable=self._sel_name_var, anchor=tk.W)
         self.sel_name_val.grid(row=1, column=1, sticky=tk.W, padx=2)
 
         ttk.Label(selected_frame, text="RA(°):").grid(row=2, column=0, sticky=tk.W)
-        self.sel_ra_val = ttk.Label(selected_frame, text="—")
+        self._sel_ra_var = tk.StringVar(value="—")
+        self.sel_ra_val = ttk.Label(selected_frame, textvariable=self._sel_ra_var)
         self.sel_ra_val.grid(row=2, column=1, sticky=tk.W, padx=2)
 
         ttk.Label(selected_frame, text="DEC(°):").grid(row=3, column=0, sticky=tk.W)
-        self.sel_dec_val = ttk.Label(selected_frame, text="—")
+        self._sel_dec_var = tk.StringVar(value="—")
+        self.sel_dec_val = ttk.Label(selected_frame, textvariable=self._sel_dec_var)
         self.sel_dec_val.grid(row=3, column=1, sticky=tk.W, padx=2)
 
         ttk.Label(selected_frame, text="Az(°):").grid(row=4, column=0, sticky=tk.W)
-        self.sel_az_val = ttk.Label(selected_frame, text="—")
+        self._sel_az_var = tk.StringVar(value="—")
+        self.sel_az_val = ttk.Label(selected_frame, textvariable=self._sel_az_var)
         self.sel_az_val.grid(row=4, column=1, sticky=tk.W, padx=2)
 
         ttk.Label(selected_frame, text="Alt(°):").grid(row=5, column=0, sticky=tk.W)
-        self.sel_alt_val = ttk.Label(selected_frame, text="—")
+        self._sel_alt_var = tk.StringVar(value="—")
+        self.sel_alt_val = ttk.Label(selected_frame, textvariable=self._sel_alt_var)
         self.sel_alt_val.grid(row=5, column=1, sticky=tk.W, padx=2)
 
         # === 手控板区域 (紧凑布局) ===
         handpad_frame = ttk.LabelFrame(main_frame, text="手控板", padding="5")
         handpad_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=5)
 
+        # 方向键为按住移动、松开停止(按下/松开事件直接绑定，不使用command——
+        # command在松开时触发，会在停止之后再次开始移动)
         # 使用水平布局: 左侧是方向控制,右侧是速度和停止按钮
         # 左侧: 方向控制 (十字形)
         control_frame = ttk.Frame(handpad_frame)
         control_frame.grid(row=0, column=0, padx=10, pady=5)
 
         # 北 (上)
-        self.btn_north = ttk.Button(control_frame, text="▲", width=4,
-                                    command=lambda: self.start_move('north'))
+        self.btn_north = ttk.Button(control_frame, text="▲", width=4)
         self.btn_north.grid(row=0, column=1, padx=2, pady=2)
-        self.btn_north.bind('<ButtonRelease-1>', lambda e: self.stop_move())
+        self._bind_hold_move(self.btn_north, 'north')
 
         # 西 (左)
-        self.btn_west = ttk.Button(control_frame, text="◄", width=4,
-                                   command=lambda: self.start_move('west'))
+        self.btn_west = ttk.Button(control_frame, text="◄", width=4)
         self.btn_west.grid(row=1, column=0, padx=2, pady=2)
-        self.btn_west.bind('<ButtonRelease-1>', lambda e: self.stop_move())
+        self._bind_hold_move(self.btn_west, 'west')
 
         # 停止按钮 (中间)
         self.btn_stop = ttk.Button(control_frame, text="■", width=4,
@@ -443,16 +583,14 @@ class SkyWatcherUI:
         self.btn_stop.grid(row=1, column=1, padx=2, pady=2)
 
         # 东 (右)
-        self.btn_east = ttk.Button(control_frame, text="►", width=4,
-                                   command=lambda: self.start_move('east'))
+        self.btn_east = ttk.Button(control_frame, text="►", width=4)
         self.btn_east.grid(row=1, column=2, padx=2, pady=2)
-        self.btn_east.bind('<ButtonRelease-1>', lambda e: self.stop_move())
+        self._bind_hold_move(self.btn_east, 'east')
 
         # 南 (下)
-        self.btn_south = ttk.Button(control_frame, text="▼", width=4,
-                                    command=lambda: self.start_move('south'))
+        self.btn_south = ttk.Button(control_frame, text="▼", width=4)
         self.btn_south.grid(row=2, column=1, padx=2, pady=2)
-        self.btn_south.bind('<ButtonRelease-1>', lambda e: self.stop_move())
+        self._bind_hold_move(self.btn_south, 'south')
 
         # 右侧: 速度输入和停止按钮
         right_frame = ttk.Frame(handpad_frame)
@@ -461,12 +599,19 @@ class SkyWatcherUI:
         # 速度输入 (16进制,6位)
         ttk.Label(right_frame, text="速度(hex):").grid(row=0, column=0, sticky=tk.W, pady=2)
         self.speed_var = tk.StringVar(value="000100")  # 默认慢速
-        speed_entry = ttk.Entry(right_frame, textvariable=self.speed_var, width=10)
-        speed_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+        # 输入时拒绝非16进制字符/超长输入
+        self.speed_entry = ttk.Entry(right_frame, textvariable=self.speed_var, width=10,
+                                     validate="key",
+                                     validatecommand=(self.root.register(self._vhex), "%P"))
+        self.speed_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+        # 速度值变化时校验一次并缓存,start_move直接使用缓存结果
+        self._speed_valid = True
+        self._speed_hex = "000100"
+        self.speed_var.trace_add("write", self._on_speed_changed)
 
         # 速度说明
         ttk.Label(right_frame, text="(6位16进制)",
-                 foreground="gray", font=('Arial', 8)).grid(row=0, column=2, sticky=tk.W, padx=2)
+                 style="Hint.TLabel").grid(row=0, column=2, sticky=tk.W, padx=2)
 
         # 停止所有按钮
         ttk.Button(right_frame, text="停止所有", width=10,
@@ -494,7 +639,11 @@ class SkyWatcherUI:
         self.ra_speed_slider.grid(row=0, column=1, padx=5)
 
         # RA速度显示
-        self.ra_speed_label = ttk.Label(ra_speed_frame, text="256 (000100)", width=15)
+        # 速度标签: 滑块拖动时合并刷新，缓存已显示文本
+        self._speed_lbl_pending = set()
+        self._speed_lbl_text = {'ra': "256 (000100)", 'dec': "256 (000100)"}
+        self._ra_speed_text_var = tk.StringVar(value="256 (000100)")
+        self.ra_speed_label = ttk.Label(ra_speed_frame, textvariable=self._ra_speed_text_var, width=15)
         self.ra_speed_label.grid(row=0, column=2, padx=5)
 
         # RA设置按钮
@@ -515,7 +664,8 @@ class SkyWatcherUI:
         self.dec_speed_slider.grid(row=0, column=1, padx=5)
 
         # DEC速度显示
-        self.dec_speed_label = ttk.Label(dec_speed_frame, text="256 (000100)", width=15)
+        self._dec_speed_text_var = tk.StringVar(value="256 (000100)")
+        self.dec_speed_label = ttk.Label(dec_speed_frame, textvariable=self._dec_speed_text_var, width=15)
         self.dec_speed_label.grid(row=0, column=2, padx=5)
 
         # DEC设置按钮
@@ -528,31 +678,23 @@ class SkyWatcherUI:
 
         ttk.Label(preset_frame, text="速度预设:", width=12).grid(row=0, column=0, sticky=tk.W)
 
-        ttk.Button(preset_frame, text="很慢(16)",
-                   command=lambda: self.set_preset_speed(16)).grid(row=0, column=1, padx=2)
-        ttk.Button(preset_frame, text="慢速(256)",
-                   command=lambda: self.set_preset_speed(256)).grid(row=0, column=2, padx=2)
-        ttk.Button(preset_frame, text="中速(4096)",
-                   command=lambda: self.set_preset_speed(4096)).grid(row=0, column=3, padx=2)
-        ttk.Button(preset_frame, text="快速(65536)",
-                   command=lambda: self.set_preset_speed(65536)).grid(row=0, column=4, padx=2)
-        ttk.Button(preset_frame, text="停止(0)",
-                   command=lambda: self.set_preset_speed(0)).grid(row=0, column=5, padx=2)
+        for col, (text, speed) in enumerate((
+            ("很慢(16)", 16),
+            ("慢速(256)", 256),
+            ("中速(4096)", 4096),
+            ("快速(65536)", 65536),
+            ("停止(0)", 0),
+        ), start=1):
+            ttk.Button(preset_frame, text=text,
+                       command=functools.partial(self.set_preset_speed, speed)).grid(row=0, column=col, padx=2)
 
         # 默认隐藏轴速控制区，避免占据空间
         self.speed_control_frame = speed_control_frame
         self.speed_control_visible = False
         self.speed_control_frame.grid_remove()
 
-        # === 日志区域（移至Notebook的“日志”页面）===
-        log_frame = ttk.LabelFrame(self._log_tab, text="日志", padding="10")
-        log_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
-        log_frame.columnconfigure(0, weight=1)
-        log_frame.rowconfigure(0, weight=1)
-
-        # 日志文本框
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=15, font=("Courier", 9))
-        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # === 日志区域（Notebook的“日志”页面，首次切换到该页时再构建）===
+        self.log_text = None
 
         # === 控制按钮区域 ===
         button_frame = ttk.Frame(main_frame, padding="10")
@@ -587,9 +729,80 @@ class SkyWatcherUI:
         if self.synscan:
             self.root.after(100, self.start_monitoring)  # 延迟100ms启动,确保UI完全初始化
 
-        # 启动“选中目标”自动刷新（延迟，确保日志区已创建）
+        # 启动“选中目标”自动刷新（延迟，确保日志区已创建）；选中目标不变时逐步放慢轮询
+        self._sel_poll_ms = self._SEL_POLL_MIN_MS
+        self._sel_last_texts = None
         self.root.after(200, self._selected_auto_refresh_tick)
 
+    def _on_tab_changed(self, event=None):
+        """首次切换到日志页/地点时间页时构建其控件(after_idle: 先完成标签切换的绘制)"""
+        selected = self.notebook.select()
+        if selected == str(self._log_tab) and self.log_text is None:
+            self.root.after_idle(self._build_log_tab)
+        elif selected == str(self._env_tab) and not self._env_tab_built:
+            self._env_tab_built = True
+            self.root.after_idle(self._build_env_tab)
+
+    def _build_log_tab(self):
+        """构建日志页，并写入构建前缓冲的日志"""
+        if self.log_text is not None:
+            return
+        log_frame = ttk.LabelFrame(self._log_tab, text="日志", padding="10")
+        log_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+
+        # 日志文本框
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=15, font=self._font_log)
+        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        if not self._log_flush_pending:
+            self._flush_log()
+
+    def _build_env_tab(self):
+        """构建地点/时间页"""
+        loc_frame = ttk.LabelFrame(self._env_tab, text="地点预设", padding=10)
+        loc_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=6)
+        loc_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(loc_frame, text="地点:").grid(row=0, column=0, sticky=tk.W)
+        loc_names = list(self._preset_locations)
+        self.env_loc_combo = ttk.Combobox(loc_frame, textvariable=self.env_loc_var, width=20, state="readonly",
+                                          values=loc_names)
+        self.env_loc_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=6)
+        self.env_loc_combo.current(loc_names.index("北京"))
+
+        # 经纬度提示绑定到变量，由 env_loc_var 的 trace 更新(下拉选择或代码设置地点都会刷新)
+        self.env_loc_info = ttk.Label(loc_frame, textvariable=self._env_loc_info_var)
+        self.env_loc_info.grid(row=0, column=2, sticky=tk.W, padx=6)
+
+        ttk.Button(loc_frame, text="应用地点(设备+Stellarium)", command=self.apply_location_to_both).grid(row=0, column=3, padx=8)
+
+        # 时间与时区
+        time_frame = ttk.LabelFrame(self._env_tab, text="时间/时区", padding=10)
+        time_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=6)
+        time_frame.columnconfigure(5, weight=1)
+
+        ttk.Label(time_frame, text="时间预设:").grid(row=0, column=0, sticky=tk.W)
+        self.env_time_combo = ttk.Combobox(time_frame, textvariable=self.env_time_preset_var, width=12, state="readonly",
+                                           values=["当前时间", *self._SOLAR_MD])
+        self.env_time_combo.grid(row=0, column=1, padx=6, sticky=tk.W)
+
+        ttk.Label(time_frame, text="时区(UTC±小时):").grid(row=0, column=2, sticky=tk.W, padx=(12, 0))
+        self.env_tz_combo = ttk.Combobox(time_frame, textvariable=self.env_tz_var, width=4, state="readonly",
+                                         values=[str(i) for i in range(-12, 15)])
+        self.env_tz_combo.grid(row=0, column=3, sticky=tk.W)
+
+        ttk.Button(time_frame, text="应用时间/时区(设备+Stellarium)", command=self.apply_time_to_both).grid(row=0, column=4, padx=8)
+
+        # 随机GOTO
+        rand_frame = ttk.LabelFrame(self._env_tab, text="随机GOTO", padding=10)
+        rand_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=6)
+
+        ttk.Label(rand_frame, text="数量(个):").grid(row=0, column=0, sticky=tk.W)
+        ttk.Spinbox(rand_frame, from_=1, to=999, textvariable=self.env_goto_count_var, width=6).grid(row=0, column=1, padx=6)
+        ttk.Button(rand_frame, text="开始随机GOTO", command=self.start_random_goto_sequence).grid(row=0, column=2, padx=8)
+        ttk.Button(rand_frame, text="停止", command=self.stop_random_goto_sequence).grid(row=0, column=3, padx=4)
+
     def log(self, message: str):
         """
         添加日志消息
@@ -598,10 +811,16 @@ class SkyWatcherUI:
         Args:
             message: 日志消息
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_msg = f"[{timestamp}] {message}\n"
+        self.logger.info(message)
+
+    def _append_log(self, log_msg: str):
+        """TkTextHandler输出: 缓冲格式化后的日志行，合并写入日志区"""
+        # 后台线程调用时转交Tk主线程执行
+        if threading.current_thread() is not self._ui_thread:
+            self._post_ui(self._append_log, log_msg)
+            return
 
-        # 日志区未创建前，先打印到控制台，避免初始化阶段出错
+        # 界面未创建前，先打印到控制台，避免初始化阶段出错
         if not hasattr(self, 'log_text'):
             try:
                 print(log_msg, end='')
@@ -609,20 +828,96 @@ class SkyWatcherUI:
                 pass
             return
 
-        self.log_text.insert(tk.END, log_msg)
-        self.log_text.see(tk.END)  # 自动滚动到底部
+        # 日志页尚未构建：先缓冲(只保留最近 _LOG_MAX 条)，构建时一次写入
+        if self.log_text is None:
+            self._log_buf.append(log_msg)
+            return
+
+        # 先缓冲，100ms内的多条消息合并为一次 insert
+        self._log_buf.append(log_msg)
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.root.after(100, self._flush_log)
+
+    def _flush_log(self):
+        """将缓冲的日志一次性写入日志区，并裁剪超出上限的旧行"""
+        self._log_flush_pending = False
+        if not self._log_buf:
+            return
+        chunk = "".join(self._log_buf)
+        self._log_buf.clear()
+        # 仅当视图已在底部时才自动滚动；用户向上翻看时不打断，也省去一次视图重绘
+        at_bottom = self.log_text.yview()[1] >= 0.999
+        self.log_text.insert(tk.END, chunk)
+        # 以控件实际行数为准(每行以\n结尾，end-1c 位于最后一行之后)
+        lines = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        if lines > self._LOG_MAX + self._LOG_TRIM_SLACK:
+            self.log_text.delete("1.0", f"{lines - self._LOG_MAX + 1}.0")
+        if at_bottom:
+            self.log_text.see(tk.END)  # 自动滚动到底部
+
+    def _post_ui(self, fn, *args):
+        """从后台线程投递一次UI调用(线程安全)，由 _pump_ui_calls() 在Tk主线程中执行"""
+        self._ui_calls.put((fn, args))
+
+    def _pump_ui_calls(self):
+        """执行后台线程投递的UI调用(Tk主线程, 每50ms)"""
+        while True:
+            try:
+                fn, args = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception:
+                self.logger.exception("UI回调异常")
+        self.root.after(50, self._pump_ui_calls)
+
+    def _submit_io(self, fn, *args):
+        """提交设备I/O任务到单线程执行器，任务异常写入日志"""
+        future = self._io.submit(fn, *args)
+        future.add_done_callback(self._on_io_done)
+        return future
+
+    def _submit_net(self, fn, *args):
+        """提交Stellarium HTTP任务到网络执行器，任务异常写入日志"""
+        future = self._net.submit(fn, *args)
+        future.add_done_callback(self._on_net_done)
+        return future
+
+    def _on_io_done(self, future):
+        """设备I/O任务完成回调(执行器线程)"""
+        exc = future.exception()
+        if exc is not None:
+            self.log(f"✗ 设备命令异常: {exc}")
+
+    def _on_net_done(self, future):
+        """Stellarium HTTP任务完成回调(执行器线程)"""
+        exc = future.exception()
+        if exc is not None:
+            self.log(f"✗ Stellarium请求异常: {exc}")
 
     def clear_log(self):
         """清除日志"""
+        self._log_buf.clear()
+        if self.log_text is None:
+            return
         self.log_text.delete(1.0, tk.END)
 
     def _parse_gps_label_to_deg(self):
-        """解析 GPS 标签文本为 (lat, lon) 十进制度。示例: "40.0°N, 120.0°E"""
+        """返回 GPS 标签对应的 (lat, lon) 十进制度(文本变化时已解析缓存)，无法解析返回None"""
+        return getattr(self, '_gps_deg', None)
+
+    def _on_gps_changed(self, *args):
+        """GPS 标签文本变化时重新解析"""
+        self._gps_deg = self._parse_gps_text(self._gps_var.get())
+
+    @staticmethod
+    def _parse_gps_text(text: str):
+        """解析 GPS 文本为 (lat, lon) 十进制度。示例: "40.0°N, 120.0°E"""
         try:
-            text = self.gps_label.cget('text') if hasattr(self, 'gps_label') else ''
             text = text.strip().replace(' ', '')
-            # 支持 "40.0°N,120.0°E" / "40.0N,120.0E" / "+40.0,-120.0"
-            m = re.match(r'^([+\-]?\d+(?:\.\d+)?)°?([NSns])?,?([+\-]?\d+(?:\.\d+)?)°?([EWew])?$', text)
+            m = _GPS_RE.match(text)
             if not m:
                 return None
             lat = float(m.group(1)); lon = float(m.group(3))
@@ -635,6 +930,18 @@ class SkyWatcherUI:
         except Exception:
             return None
 
+    def _on_env_loc_changed(self, *args):
+        """地点变量变化时更新经纬度提示文本"""
+        lat, lon = self._preset_locations.get(self.env_loc_var.get(), (0.0, 0.0))
+        self._env_loc_info_var.set(f"lat={lat:.2f}, lon={lon:.2f}")
+
+    def _on_env_tz_changed(self, *args):
+        """时区变量变化时更新整数缓存(无效值按0处理)"""
+        try:
+            self._tz_hours = int(self.env_tz_var.get())
+        except (ValueError, tk.TclError):
+            self._tz_hours = 0
+
     def update_status(self, serial_connected: bool, stellarium_connected: bool):
         """
         更新连接状态
@@ -643,29 +950,44 @@ class SkyWatcherUI:
             serial_connected: 串口是否连接
             stellarium_connected: Stellarium是否连接
         """
-        if serial_connected:
-            self.serial_status.config(text="已连接", foreground="green")
-        else:
-            self.serial_status.config(text="未连接", foreground="red")
+        status = (bool(serial_connected), bool(stellarium_connected))
+        if status == self._last_status:
+            return
+        last_serial, last_stellarium = self._last_status
+        self._last_status = status
 
-        if stellarium_connected:
-            self.stellarium_status.config(text="已连接", foreground="green")
-        else:
-            self.stellarium_status.config(text="未连接", foreground="red")
+        if status[0] != last_serial:
+            self._serial_status_var.set("已连接" if serial_connected else "未连接")
+            self.serial_status.config(style="Green.TLabel" if serial_connected else "Red.TLabel")
+
+        if status[1] != last_stellarium:
+            self._stellarium_status_var.set("已连接" if stellarium_connected else "未连接")
+            self.stellarium_status.config(style="Green.TLabel" if stellarium_connected else "Red.TLabel")
 
     def refresh_serial_ports(self, pref_port: Optional[str] = None):
-        """刷新可用串口列表，并优先选中 pref_port 或当前已连接串口"""
+        """刷新可用串口列表(后台线程枚举)，并优先选中 pref_port 或当前已连接串口"""
+        threading.Thread(target=self._enumerate_ports, args=(pref_port,), daemon=True).start()
+
+    def _enumerate_ports(self, pref_port: Optional[str]):
+        """枚举串口(后台线程)，结果交回Tk主线程"""
         try:
             ports = [p.device for p in list_ports.comports()]
         except Exception:
             ports = []
-        if not ports:
-            ports = []
+        self._post_ui(self._apply_port_list, ports, pref_port)
+
+    def _is_serial_open(self) -> bool:
+        """当前是否有已打开的串口连接"""
+        ser = getattr(getattr(self, 'synscan', None), 'serial', None)
+        return ser is not None and ser.is_open
+
+    def _apply_port_list(self, ports, pref_port: Optional[str] = None):
+        """更新端口下拉框(Tk主线程)"""
         self.port_combo['values'] = ports
 
         # 优先顺序：已连接端口 > 传入的pref_port > 配置中保存的 > 列表第一个
         current = None
-        if getattr(self, 'synscan', None) and getattr(self.synscan, 'serial', None) and self.synscan.serial and self.synscan.serial.is_open:
+        if self._is_serial_open():
             current = getattr(self.synscan, 'port', None)
         target = current or pref_port or (None)
         if target and target in ports:
@@ -683,7 +1005,7 @@ class SkyWatcherUI:
 
         # 若已连接且是同一端口
         try:
-            if self.synscan and getattr(self.synscan, 'serial', None) and self.synscan.serial and self.synscan.serial.is_open:
+            if self._is_serial_open():
                 if getattr(self.synscan, 'port', None) == port:
                     self.log(f"✓ 已连接到 {port}")
                     return
@@ -710,9 +1032,17 @@ class SkyWatcherUI:
 
         from synscan import SynScanProtocol
         try:
-            new_syn = SynScanProtocol(port, 9600, command_interval_ms=interval_ms)
-            if new_syn.connect():
+            # 已有SynScanProtocol实例时复用(包括其 Serial 对象)；首次连接或当前为模拟器等其他对象时新建
+            if isinstance(self.synscan, SynScanProtocol):
+                new_syn = self.synscan
+                new_syn.command_interval_ms = interval_ms
+                ok = new_syn.reopen(port, 9600)
+            else:
+                new_syn = SynScanProtocol(port, 9600, command_interval_ms=interval_ms)
+                ok = new_syn.connect()
+            if ok:
                 self.synscan = new_syn
+                self._bind_direction_fns()
                 self.update_status(True, getattr(self, 'stellarium_sync', None) is not None)
                 self.log(f"✓ 串口已连接: {port}")
                 # 保存到配置
@@ -761,7 +1091,7 @@ class SkyWatcherUI:
 
     def disconnect_serial(self):
         """断开当前串口连接"""
-        if self.synscan and getattr(self.synscan, 'serial', None) and self.synscan.serial and self.synscan.serial.is_open:
+        if self._is_serial_open():
             try:
                 self.synscan.disconnect()
                 self.update_status(False, getattr(self, 'stellarium_sync', None) is not None)
@@ -779,189 +1109,318 @@ class SkyWatcherUI:
             ra_deg: 赤经(度)
             dec_deg: 赤纬(度)
         """
-        # 转换RA为HMS
-        ra_hours = ra_deg / 15.0
-        ra_h = int(ra_hours)
-        ra_m = int((ra_hours - ra_h) * 60)
-        ra_s = int(((ra_hours - ra_h) * 60 - ra_m) * 60)
-        ra_str = f"{ra_h:02d}h{ra_m:02d}m{ra_s:02d}s"
+        DD = self._DD
+        # 转换RA为HMS：先取整为总秒数再 divmod，避免浮点截断误差 (240 = 3600/15)
+        ra_total_s = int(round((ra_deg % 360.0) * 240))
+        ra_h, rem = divmod(ra_total_s, 3600)
+        ra_m, ra_s = divmod(rem, 60)
+        ra_str = "".join((DD[ra_h % 24], "h", DD[ra_m], "m", DD[ra_s], "s"))
 
         # 转换DEC为DMS
         dec_sign = '+' if dec_deg >= 0 else '-'
-        dec_abs = abs(dec_deg)
-        dec_d = int(dec_abs)
-        dec_m = int((dec_abs - dec_d) * 60)
-        dec_s = int(((dec_abs - dec_d) * 60 - dec_m) * 60)
-        dec_str = f"{dec_sign}{dec_d:02d}°{dec_m:02d}'{dec_s:02d}\""
-
-        # 更新显示
-        self.ra_label.config(text=ra_str)
-        self.dec_label.config(text=dec_str)
-        self.ra_deg_label.config(text=f"{ra_deg:.4f}°")
-        self.dec_deg_label.config(text=f"{dec_deg:.4f}°")
+        dec_total_s = int(round(abs(dec_deg) * 3600))
+        dec_d, rem = divmod(dec_total_s, 3600)
+        dec_m, dec_s = divmod(rem, 60)
+        dec_str = "".join((dec_sign, DD[dec_d], "°", DD[dec_m], "'", DD[dec_s], "\""))
+
+        # 更新显示(文本未变化时跳过，减少Tcl变量写入)
+        texts = (ra_str, dec_str, f"{ra_deg:.4f}°", f"{dec_deg:.4f}°")
+        tk_vars = (self._ra_var, self._dec_var, self._ra_deg_var, self._dec_deg_var)
+        last = self._last_pos_text
+        for i, text in enumerate(texts):
+            if text != last[i]:
+                tk_vars[i].set(text)
+        self._last_pos_text = texts
 
     def update_time(self):
-        """更新系统时间显示"""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.time_label.config(text=current_time)
+        """更新系统时间显示(日期部分每天只格式化一次)"""
+        now = time.localtime()
+        ymd = now[:3]
+        if ymd != self._last_ymd:
+            self._last_ymd = ymd
+            self._last_ymd_str = time.strftime("%Y-%m-%d", now)
+        self._time_var.set(f"{self._last_ymd_str} {now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}")
+
+    def _worker_main(self):
+        """常驻监控线程入口：等待开始信号，然后运行监控循环"""
+        while not self._shutdown.is_set():
+            self._go.wait()
+            if self._shutdown.is_set():
+                break
+            self.monitoring_loop()
 
     def monitoring_loop(self):
         """监控循环(在后台线程中运行)"""
         self.log("开始监控...")
 
-        while self.running:
+        while self._go.is_set() and not self._shutdown.is_set():
             try:
-                # 更新时间
-                self.root.after(0, self.update_time)
-
                 # 获取位置
                 if self.synscan:
-                    position = self.synscan.get_ra_dec()
-                    if position:
+                    try:
+                        position = self.synscan.get_ra_dec()
+                    except MountReadError as e:
+                        # 异常中已带两轴原始响应，无需再次读取串口
+                        self._put_sample(None, f"获取位置失败 - RA响应: {e.ra_resp}, DEC响应: {e.dec_resp}")
+                    else:
                         ra_deg, dec_deg = position
 
                         # 保存当前位置
                         self.current_ra = ra_deg
                         self.current_dec = dec_deg
 
-                        # 更新UI
-                        self.root.after(0, lambda: self.update_position(ra_deg, dec_deg))
+                        # 交给UI显示(Tk主线程消费)，直接复用读取到的元组
+                        self._put_sample(position)
 
-                        # 同步到Stellarium
+                        # 同步到Stellarium(交给独立线程,不阻塞轮询)
                         if self.stellarium_sync:
-                            self.stellarium_sync.update_telescope_position(ra_deg, dec_deg)
+                            self._publish_stellarium_position(ra_deg, dec_deg)
 
-                        self.root.after(0, lambda: self.log(f"位置: RA={ra_deg:.2f}° DEC={dec_deg:.2f}°"))
-                    else:
-                        # 获取详细的错误信息
-                        ra_steps = self.synscan.get_position(self.synscan.AXIS_RA)
-                        dec_steps = self.synscan.get_position(self.synscan.AXIS_DEC)
-                        error_msg = f"获取位置失败 - RA步进: {ra_steps}, DEC步进: {dec_steps}"
-                        self.root.after(0, lambda msg=error_msg: self.log(msg))
-
-                time.sleep(1)  # 每秒更新一次
+                if self._stop_evt.wait(1.0):  # 每秒更新一次，停止时立即醒来
+                    break
 
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"错误: {e}"))
-                time.sleep(1)
+            except (serial.SerialException, TimeoutError, OSError) as e:
+                now = time.time()
+                key = type(e).__name__ + str(e)
+                if key != self._last_err or now - self._last_err_ts > 5:
+                    self._last_err = key
+                    self._last_err_ts = now
+                    self.logger.error("错误: %s", e)
+                if self._stop_evt.wait(1.0):
+                    break
+            except Exception:
+                # 非预期异常只记录到日志系统，不刷屏UI
+                self.logger.exception("监控循环异常")
+                if self._stop_evt.wait(1.0):
+                    break
 
         self.log("监控已停止")
 
+    def _put_sample(self, pos, msg: Optional[str] = None):
+        """监控线程投递样本；队列满时丢弃最旧的一个"""
+        item = (time.time(), pos, msg)
+        try:
+            self.sample_q.put_nowait(item)
+        except queue.Full:
+            try:
+                self.sample_q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.sample_q.put_nowait(item)
+            except queue.Full:
+                pass
+
+    def tick(self):
+        """时钟节拍(Tk主线程)：对齐到下一个整秒，避免漂移及同一秒重复刷新"""
+        self.update_time()
+        delay_ms = int((1.0 - time.time() % 1.0) * 1000) + 5
+        self._after_id = self.root.after(delay_ms, self.tick)
+
+    # 样本消费间隔(毫秒)：监控每秒产出一个样本，无需更高频率轮询队列
+    _DRAIN_MS = 100
+
+    def _drain(self):
+        """消费监控线程产出的样本(Tk主线程, 每 _DRAIN_MS 毫秒)"""
+        if not self.running:
+            self._drain_id = None
+            return
+        latest = None
+        while True:
+            try:
+                ts, pos, msg = self.sample_q.get_nowait()
+            except queue.Empty:
+                break
+            if pos is not None:
+                ra_deg, dec_deg = latest = pos
+                if self._fail_count:
+                    self.logger.info("位置读取已恢复 (此前连续失败%d次)", self._fail_count)
+                    self._fail_count = 0
+                # 仅在位置变化>=0.01°或距上次记录超过30秒时写日志
+                if (self._last_logged_ra is None
+                        or abs(ra_deg - self._last_logged_ra) >= 0.01
+                        or abs(dec_deg - self._last_logged_dec) >= 0.01
+                        or ts - self._last_log_t > 30):
+                    self.logger.info("位置: RA=%.2f° DEC=%.2f°", ra_deg, dec_deg)
+                    self._last_logged_ra = ra_deg
+                    self._last_logged_dec = dec_deg
+                    self._last_log_t = ts
+            elif msg:
+                # 连续失败时只记录首次及每10次的汇总
+                self._fail_count += 1
+                if self._fail_count == 1:
+                    self.log(msg)
+                elif self._fail_count % 10 == 0:
+                    self.logger.info("%s (已连续失败%d次)", msg, self._fail_count)
+        # 本轮积压的多个样本只刷新一次显示(取最新)
+        if latest is not None:
+            self.update_position(*latest)
+        self._drain_id = self.root.after(self._DRAIN_MS, self._drain)
+
+    def _publish_stellarium_position(self, ra_deg: float, dec_deg: float):
+        """投递最新位置给Stellarium同步线程(先丢弃尚未发送的旧位置)"""
+        try:
+            while True:
+                self._stellarium_q.get_nowait()
+        except queue.Empty:
+            pass
+        self._stellarium_q.put((ra_deg, dec_deg))
+
+    def _stellarium_worker(self):
+        """Stellarium同步线程(后台运行)：逐个发送队列中的最新位置"""
+        while True:
+            ra_deg, dec_deg = self._stellarium_q.get()
+            sync = self.stellarium_sync
+            if not sync:
+                continue
+            try:
+                sync.update_telescope_position(ra_deg, dec_deg)
+            except Exception as e:
+                self.logger.error("Stellarium同步异常: %s", e)
+
     def start_monitoring(self):
         """开始监控"""
         if not self.running:
             self.running = True
+            self._stop_evt.clear()
             self.start_button.config(state=tk.DISABLED)
             self.stop_button.config(state=tk.NORMAL)
 
+            # UI刷新由 after 节拍驱动，串口读取在常驻监控线程
+            self._drain()
+
             # 如果设备已连接且未预置经纬度，则尝试从UI GPS标签解析并下发 :Z1 (海拔默认0)
-            if self.synscan and (getattr(self.synscan, 'latitude', None) is None or getattr(self.synscan, 'longitude', None) is None):
+            # 下发在I/O线程执行，完成后再唤醒监控线程，保持"先定位再轮询"的顺序
+            syn = self.synscan
+            if syn and (getattr(syn, 'latitude', None) is None or getattr(syn, 'longitude', None) is None):
                 parsed = self._parse_gps_label_to_deg()
                 if parsed:
                     lat, lon = parsed
-                    try:
-                        self.synscan.set_location(lat, lon, 0)
-                        self.log(f"已根据UI GPS下发位置(:Z1): lat={lat:.4f}, lon={lon:.4f}, elev=0")
-                    except Exception as e:
-                        self.log(f"✗ 根据UI GPS下发位置失败: {e}")
 
-            # 启动监控线程
-            self.update_thread = threading.Thread(target=self.monitoring_loop, daemon=True)
-            self.update_thread.start()
+                    def _do():
+                        try:
+                            syn.set_location(lat, lon, 0)
+                            self.log(f"已根据UI GPS下发位置(:Z1): lat={lat:.4f}, lon={lon:.4f}, elev=0")
+                        except Exception as e:
+                            self.log(f"✗ 根据UI GPS下发位置失败: {e}")
+                        finally:
+                            if self.running:
+                                self._go.set()
+                    self._submit_io(_do)
+                    return
+
+            # 唤醒常驻监控线程
+            self._go.set()
 
     def stop_monitoring(self):
         """停止监控"""
         if self.running:
             self.running = False
+            self._go.clear()
+            self._stop_evt.set()
+            if self._drain_id is not None:
+                self.root.after_cancel(self._drain_id)
+                self._drain_id = None
             self.start_button.config(state=tk.NORMAL)
             self.stop_button.config(state=tk.DISABLED)
 
     def goto_radec(self):
         """GOTO到指定的RA/DEC坐标"""
+        self._flush_coord_sync()
         try:
-            ra_deg = float(self.goto_ra_entry.get())
-            dec_deg = float(self.goto_dec_entry.get())
+            ra_deg = float(self.goto_ra_var.get())
+            dec_deg = float(self.goto_dec_var.get())
+        except ValueError:
+            self.log("✗ 坐标格式错误,请输入数字")
+            return
 
-            self.log(f"GOTO RA/DEC: RA={ra_deg}° DEC={dec_deg}°")
+        self.log(f"GOTO RA/DEC: RA={ra_deg}° DEC={dec_deg}°")
 
-            if self.synscan:
-                if self.synscan.goto_ra_dec(ra_deg, dec_deg):
-                    self.log("✓ GOTO命令已发送")
+        if not self.synscan:
+            self.log("✗ 设备未连接")
+            return
+        syn = self.synscan
 
-                    # 换颜色
-                    if self.stellarium_sync:
-                        self.stellarium_sync.next_color()
-                        self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
-                else:
-                    self.log("✗ GOTO命令失败")
-            else:
-                self.log("✗ 设备未连接")
+        def _do():
+            if syn.goto_ra_dec(ra_deg, dec_deg):
+                self.log("✓ GOTO命令已发送")
 
-        except ValueError:
-            self.log("✗ 坐标格式错误,请输入数字")
+                # 换颜色
+                if self.stellarium_sync:
+                    self.stellarium_sync.next_color()
+                    self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
+            else:
+                self.log("✗ GOTO命令失败")
+        self._submit_io(_do)
 
     def goto_slew(self):
         """使用SlewToCoordinates方法GOTO到指定的RA/DEC坐标"""
+        self._flush_coord_sync()
         try:
-            ra_deg = float(self.goto_ra_entry.get())
-            dec_deg = float(self.goto_dec_entry.get())
+            ra_deg = float(self.goto_ra_var.get())
+            dec_deg = float(self.goto_dec_var.get())
+        except ValueError:
+            self.log("✗ 坐标格式错误,请输入数字")
+            return
 
-            self.log(f"GOTO (Slew) RA/DEC: RA={ra_deg}° DEC={dec_deg}°")
+        self.log(f"GOTO (Slew) RA/DEC: RA={ra_deg}° DEC={dec_deg}°")
 
-            if self.synscan:
-                if self.synscan.slew_to_coordinates(ra_deg, dec_deg):
-                    self.log("✓ SlewToCoordinates命令已发送")
+        if not self.synscan:
+            self.log("✗ 设备未连接")
+            return
+        syn = self.synscan
 
-                    # 换颜色
-                    if self.stellarium_sync:
-                        self.stellarium_sync.next_color()
-                        self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
-                else:
-                    self.log("✗ SlewToCoordinates命令失败")
-            else:
-                self.log("✗ 设备未连接")
+        def _do():
+            if syn.slew_to_coordinates(ra_deg, dec_deg):
+                self.log("✓ SlewToCoordinates命令已发送")
 
-        except ValueError:
-            self.log("✗ 坐标格式错误,请输入数字")
+                # 换颜色
+                if self.stellarium_sync:
+                    self.stellarium_sync.next_color()
+                    self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
+            else:
+                self.log("✗ SlewToCoordinates命令失败")
+        self._submit_io(_do)
 
     def goto_altaz(self):
         """GOTO到指定的地平坐标"""
         try:
-            az_deg = float(self.goto_az_entry.get())
-            alt_deg = float(self.goto_alt_entry.get())
-
-            self.log(f"GOTO Az/Alt: 方位角={az_deg}° 高度角={alt_deg}°")
-
-            if self.synscan:
-                # 获取当前位置
-                current_pos = self.synscan.get_ra_dec()
-
-                # 先转换为赤道坐标
-                ra_deg, dec_deg = self.synscan.altaz_to_radec(az_deg, alt_deg)
-
-                # 更新RA/DEC输入框
-                self.goto_ra_entry.delete(0, tk.END)
-                self.goto_ra_entry.insert(0, f"{ra_deg:.4f}")
-                self.goto_dec_entry.delete(0, tk.END)
-                self.goto_dec_entry.insert(0, f"{dec_deg:.4f}")
-
-                self.log(f"  转换为: RA={ra_deg:.4f}° DEC={dec_deg:.4f}°")
-
-                # 执行GOTO
-                if self.synscan.goto_altaz(az_deg, alt_deg):
-                    self.log("✓ GOTO命令已发送")
-                    # 换颜色
-                    if self.stellarium_sync:
-                        self.stellarium_sync.next_color()
-                        self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
-                else:
-                    self.log("✗ GOTO命令失败")
-            else:
-                self.log("✗ 设备未连接")
-
+            az_deg = float(self.goto_az_var.get())
+            alt_deg = float(self.goto_alt_var.get())
         except ValueError:
             self.log("✗ 坐标格式错误,请输入数字")
+            return
+        self._goto_altaz_numeric(az_deg, alt_deg)
+
+    def _goto_altaz_numeric(self, az_deg: float, alt_deg: float):
+        """按给定的方位角/高度角(度)执行GOTO，不经过输入框解析"""
+        self.log(f"GOTO Az/Alt: 方位角={az_deg}° 高度角={alt_deg}°")
+
+        if not self.synscan:
+            self.log("✗ 设备未连接")
+            return
+        syn = self.synscan
+
+        # 先转换为赤道坐标(纯计算，在Tk主线程完成)
+        ra_deg, dec_deg = syn.altaz_to_radec(az_deg, alt_deg)
+
+        # 更新RA/DEC输入框
+        self.goto_ra_var.set(f"{ra_deg:.4f}")
+        self.goto_dec_var.set(f"{dec_deg:.4f}")
 
+        self.log(f"  转换为: RA={ra_deg:.4f}° DEC={dec_deg:.4f}°")
+
+        def _do():
+            # 执行GOTO：直接使用上面已换算并显示的RA/DEC，不在I/O线程重复换算
+            if syn.goto_ra_dec(ra_deg, dec_deg):
+                self.log("✓ GOTO命令已发送")
+                # 换颜色
+                if self.stellarium_sync:
+                    self.stellarium_sync.next_color()
+                    self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
+            else:
+                self.log("✗ GOTO命令失败")
+        self._submit_io(_do)
 
     def refresh_selected_object(self, silent=False):
         """刷新Stellarium中当前选中目标信息并显示在UI"""
@@ -969,7 +1428,23 @@ class SkyWatcherUI:
             if not silent:
                 self.log("✗ Stellarium未连接")
             return
-        info = self.stellarium_sync.get_selected_object_info()
+        # 上一次查询尚未返回时不重复提交(自动刷新)
+        if self._sel_fetch_pending:
+            return
+        self._sel_fetch_pending = True
+        sync = self.stellarium_sync
+
+        def _do():
+            info = None
+            try:
+                info = sync.get_selected_object_info()
+            finally:
+                self._post_ui(self._show_selected_object, info, silent)
+        self._submit_net(_do)
+
+    def _show_selected_object(self, info, silent=False):
+        """在UI显示选中目标信息(Tk主线程)"""
+        self._sel_fetch_pending = False
         if not info:
             if not silent:
                 self.log("✗ 无法获取选中目标信息")
@@ -985,21 +1460,38 @@ class SkyWatcherUI:
         self.sel_last_info = info
 
         name = info.get("name") or "—"
-        self.sel_name_val.config(text=name)
-        self.sel_ra_val.config(text=_fmt(info.get("ra")))
-        self.sel_dec_val.config(text=_fmt(info.get("dec")))
-        self.sel_az_val.config(text=_fmt(info.get("azimuth")))
-        self.sel_alt_val.config(text=_fmt(info.get("altitude")))
-        self.log(f"✓ 选中: {name}")
+        texts = (name, _fmt(info.get("ra")), _fmt(info.get("dec")),
+                 _fmt(info.get("azimuth")), _fmt(info.get("altitude")))
+        last = self._sel_last_texts
+        if texts == last:
+            # 无变化：不刷新控件，自动轮询间隔加倍(上限 _SEL_POLL_MAX_MS)
+            self._sel_poll_ms = min(self._sel_poll_ms * 2, self._SEL_POLL_MAX_MS)
+        else:
+            self._sel_last_texts = texts
+            self._sel_poll_ms = self._SEL_POLL_MIN_MS
+            for var, text in zip((self._sel_name_var, self._sel_ra_var, self._sel_dec_var,
+                                  self._sel_az_var, self._sel_alt_var), texts):
+                var.set(text)
+        # 手动刷新总是记录；自动刷新仅在选中目标变化时记录
+        if not silent or last is None or name != last[0]:
+            self.log(f"✓ 选中: {name}")
+
+    # 选中目标自动刷新间隔(毫秒)：变化时回到最小值，稳定时逐次加倍
+    _SEL_POLL_MIN_MS = 1500
+    _SEL_POLL_MAX_MS = 6000
 
     def _selected_auto_refresh_tick(self):
         """根据勾选状态定时刷新选中目标信息"""
+        delay = self._sel_poll_ms
         try:
-            if getattr(self, 'sel_auto_refresh_var', None) and self.sel_auto_refresh_var.get():
+            if self.root.state() == 'iconic':
+                # 窗口最小化时无需刷新显示，按最慢间隔检查
+                delay = self._SEL_POLL_MAX_MS
+            elif getattr(self, 'sel_auto_refresh_var', None) and self.sel_auto_refresh_var.get():
                 self.refresh_selected_object(silent=True)
         finally:
-            # 1.5秒轮询一次
-            self._selected_auto_refresh_after = self.root.after(1500, self._selected_auto_refresh_tick)
+            # 1.5秒起轮询，目标稳定时逐步放慢
+            self._selected_auto_refresh_after = self.root.after(delay, self._selected_auto_refresh_tick)
 
     def goto_selected_object(self):
         """对 Stellarium 的当前选中目标执行 GOTO（使用 RA/DEC）"""
@@ -1011,11 +1503,28 @@ class SkyWatcherUI:
             return
 
         info = getattr(self, 'sel_last_info', None)
-        if not info:
-            info = self.stellarium_sync.get_selected_object_info()
+        if info:
+            self._goto_selected_info(info)
+            return
+        # 尚无查询结果时由网络I/O线程获取，结果回到Tk主线程再执行GOTO
+        sync = self.stellarium_sync
+
+        def _fetch():
+            info = None
+            try:
+                info = sync.get_selected_object_info()
+            finally:
+                self._post_ui(self._goto_selected_info, info)
+        self._submit_net(_fetch)
+
+    def _goto_selected_info(self, info):
+        """按选中目标信息执行GOTO(Tk主线程)"""
         if not info:
             self.log("✗ 无选中目标或获取失败")
             return
+        if not self.synscan:
+            self.log("✗ 设备未连接")
+            return
 
         try:
             ra_deg = float(info.get('ra'))
@@ -1033,13 +1542,17 @@ class SkyWatcherUI:
 
         name = info.get('name') or ''
         self.log(f"GOTO 选中: {name} RA={ra_deg}° DEC={dec_deg}°")
-        if self.synscan.goto_ra_dec(ra_deg, dec_deg):
-            self.log("✓ GOTO命令已发送")
-            if self.stellarium_sync:
-                self.stellarium_sync.next_color()
-                self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
-        else:
-            self.log("✗ GOTO命令失败")
+        syn = self.synscan
+
+        def _do():
+            if syn.goto_ra_dec(ra_deg, dec_deg):
+                self.log("✓ GOTO命令已发送")
+                if self.stellarium_sync:
+                    self.stellarium_sync.next_color()
+                    self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
+            else:
+                self.log("✗ GOTO命令失败")
+        self._submit_io(_do)
 
     def quick_goto(self, az_deg: float, alt_deg: float):
         """
@@ -1049,24 +1562,72 @@ class SkyWatcherUI:
             az_deg: 方位角(度)
             alt_deg: 高度角(度)
         """
-        # 更新输入框
-        self.goto_az_entry.delete(0, tk.END)
-        self.goto_az_entry.insert(0, str(az_deg))
-        self.goto_alt_entry.delete(0, tk.END)
-        self.goto_alt_entry.insert(0, str(alt_deg))
-
-        # 执行GOTO
-        self.goto_altaz()
+        # 输入框仅作显示，GOTO直接使用数值
+        self.goto_az_var.set(str(az_deg))
+        self.goto_alt_var.set(str(alt_deg))
+        self._goto_altaz_numeric(az_deg, alt_deg)
 
     def clear_stellarium_drawings(self):
         """清除Stellarium中的所有绘制"""
-        if self.stellarium_sync:
-            if self.stellarium_sync.clear_all_drawings():
+        if not self.stellarium_sync:
+            self.log("✗ Stellarium未连接")
+            return
+        sync = self.stellarium_sync
+
+        def _do():
+            if sync.clear_all_drawings():
                 self.log("✓ 已清除Stellarium中的所有绘制")
             else:
                 self.log("✗ 清除Stellarium绘制失败")
-        else:
-            self.log("✗ Stellarium未连接")
+        self._submit_net(_do)
+
+    def _bind_hold_move(self, button, direction: str):
+        """方向键: 按下开始移动，松开停止；串口命令经I/O线程按顺序发出"""
+        button.bind('<ButtonPress-1>', functools.partial(self._on_move_press, direction), add='+')
+        button.bind('<ButtonRelease-1>', self._on_move_release, add='+')
+
+    def _on_move_press(self, direction: str, event=None):
+        self.start_move(direction)
+
+    def _on_move_release(self, event=None):
+        self.stop_move()
+
+    def _bind_direction_fns(self):
+        """按当前synscan对象建立 方向 -> 移动函数 映射(连接/重连后调用)；设备对象缺少的方法(如模拟器)跳过"""
+        syn = self.synscan
+        names = {
+            'north': 'move_dec_positive',  # 北 = DEC正向
+            'south': 'move_dec_negative',  # 南 = DEC反向
+            'east': 'move_ra_positive',    # 东 = RA正向
+            'west': 'move_ra_negative',    # 西 = RA反向
+        }
+        fns = {d: getattr(syn, n, None) for d, n in names.items()} if syn else {}
+        self._dir_fn = {d: fn for d, fn in fns.items() if fn is not None}
+
+    def _vnum(self, proposed: str) -> bool:
+        """坐标输入框按键校验: 带符号小数"""
+        return self._NUM_PARTIAL(proposed) is not None
+
+    def _vunum(self, proposed: str) -> bool:
+        """坐标输入框按键校验: 无符号小数"""
+        return self._UNUM_PARTIAL(proposed) is not None
+
+    def _vuint2(self, proposed: str) -> bool:
+        """坐标输入框按键校验: 最多两位整数(时/分)"""
+        return self._UINT2_PARTIAL(proposed) is not None
+
+    def _vhex(self, proposed: str) -> bool:
+        """速度输入框按键校验: 只允许最多6位16进制字符"""
+        return self._HEX_PARTIAL(proposed) is not None
+
+    def _on_speed_changed(self, *args):
+        """速度输入变化时校验并缓存, 无效时输入框标红"""
+        speed = self.speed_var.get().strip()
+        valid = self._HEX6(speed) is not None
+        self._speed_valid = valid
+        if valid:
+            self._speed_hex = speed
+        self.speed_entry.config(style="TEntry" if valid else "Invalid.TEntry")
 
     def start_move(self, direction: str):
         """
@@ -1079,20 +1640,16 @@ class SkyWatcherUI:
             self.log("✗ 设备未连接")
             return
 
-        # 获取速度值 (直接从输入框)
-        speed = self.speed_var.get().strip()
-
-        # 验证速度格式 (6位16进制)
-
-        if len(speed) != 6:
-            self.log(f"✗ 速度格式错误: 必须是6位16进制数 (当前: {speed})")
+        move_fn = self._dir_fn.get(direction)
+        if move_fn is None:
+            self.log(f"✗ 未知方向或设备不支持: {direction}")
             return
 
-        try:
-            int(speed, 16)  # 验证是否为有效的16进制
-        except ValueError:
-            self.log(f"✗ 速度格式错误: 不是有效的16进制数 (当前: {speed})")
+        # 速度值已在输入变化时校验 (6位16进制)
+        if not self._speed_valid:
+            self.log(f"✗ 速度格式错误: 必须是6位16进制数 (当前: {self.speed_var.get()})")
             return
+        speed = self._speed_hex
 
         self.log(f"开始移动: {direction} (速度: 0x{speed})")
 
@@ -1101,19 +1658,7 @@ class SkyWatcherUI:
             self.stellarium_sync.next_color()
             self.log(f"🎨 切换颜色: {self.stellarium_sync.COLORS[self.stellarium_sync.color_index]}")
 
-        # 根据方向调用对应的移动函数
-        if direction == 'north':
-            # 北 = DEC正向
-            self.synscan.move_dec_positive(speed)
-        elif direction == 'south':
-            # 南 = DEC反向
-            self.synscan.move_dec_negative(speed)
-        elif direction == 'east':
-            # 东 = RA正向
-            self.synscan.move_ra_positive(speed)
-        elif direction == 'west':
-            # 西 = RA反向
-            self.synscan.move_ra_negative(speed)
+        self._submit_io(move_fn, speed)
 
     def stop_move(self):
         """停止手动移动"""
@@ -1121,7 +1666,8 @@ class SkyWatcherUI:
             return
 
         self.log("停止移动")
-        self.synscan.stop_all()
+        self._submit_io(self.synscan.stop_all)
+
     def quick_uniform_goto(self, az_deg: float):
         """均匀12点按钮的入口：读取当前高度角设置并执行 quick_goto"""
         try:
@@ -1143,10 +1689,14 @@ class SkyWatcherUI:
             return
 
         self.log("正在初始化RA轴...")
-        if self.synscan.initialize_axis(1):
-            self.log("✓ RA轴初始化成功")
-        else:
-            self.log("✗ RA轴初始化失败")
+        syn = self.synscan
+
+        def _do():
+            if syn.initialize_axis(1):
+                self.log("✓ RA轴初始化成功")
+            else:
+                self.log("✗ RA轴初始化失败")
+        self._submit_io(_do)
 
     def initialize_dec(self):
         """初始化DEC轴 (F2命令)"""
@@ -1155,10 +1705,14 @@ class SkyWatcherUI:
             return
 
         self.log("正在初始化DEC轴...")
-        if self.synscan.initialize_axis(2):
-            self.log("✓ DEC轴初始化成功")
-        else:
-            self.log("✗ DEC轴初始化失败")
+        syn = self.synscan
+
+        def _do():
+            if syn.initialize_axis(2):
+                self.log("✓ DEC轴初始化成功")
+            else:
+                self.log("✗ DEC轴初始化失败")
+        self._submit_io(_do)
 
     def initialize_all(self):
         """初始化所有轴 (F1和F2命令)"""
@@ -1167,10 +1721,14 @@ class SkyWatcherUI:
             return
 
         self.log("正在初始化所有轴...")
-        if self.synscan.initialize_mount():
-            self.log("✓ 所有轴初始化成功")
-        else:
-            self.log("✗ 轴初始化失败")
+        syn = self.synscan
+
+        def _do():
+            if syn.initialize_mount():
+                self.log("✓ 所有轴初始化成功")
+            else:
+                self.log("✗ 轴初始化失败")
+        self._submit_io(_do)
 
     def stop_ra_axis(self):
         """停止RA轴 (I1命令 - 设置速度为0)"""
@@ -1179,12 +1737,16 @@ class SkyWatcherUI:
             return
 
         self.log("正在停止RA轴 (I1 速度=000000)...")
-        # 发送I命令设置速度为0
-        response = self.synscan.send_command(self.synscan.AXIS_RA, 'I', '000000')
-        if response:
-            self.log("✓ RA轴已停止")
-        else:
-            self.log("✗ RA轴停止失败")
+        syn = self.synscan
+
+        def _do():
+            # 发送I命令设置速度为0
+            response = syn.send_command(syn.AXIS_RA, 'I', '000000')
+            if response:
+                self.log("✓ RA轴已停止")
+            else:
+                self.log("✗ RA轴停止失败")
+        self._submit_io(_do)
 
     def stop_dec_axis(self):
         """停止DEC轴 (I2命令 - 设置速度为0)"""
@@ -1193,12 +1755,16 @@ class SkyWatcherUI:
             return
 
         self.log("正在停止DEC轴 (I2 速度=000000)...")
-        # 发送I命令设置速度为0
-        response = self.synscan.send_command(self.synscan.AXIS_DEC, 'I', '000000')
-        if response:
-            self.log("✓ DEC轴已停止")
-        else:
-            self.log("✗ DEC轴停止失败")
+        syn = self.synscan
+
+        def _do():
+            # 发送I命令设置速度为0
+            response = syn.send_command(syn.AXIS_DEC, 'I', '000000')
+            if response:
+                self.log("✓ DEC轴已停止")
+            else:
+                self.log("✗ DEC轴停止失败")
+        self._submit_io(_do)
 
     def stop_both_axes(self):
         """停止两个轴 (I1和I2命令 - 设置速度为0)"""
@@ -1208,31 +1774,49 @@ class SkyWatcherUI:
 
         self.log("正在停止所有轴 (I 速度=000000)...")
 
-        # 停止RA轴
-        ra_response = self.synscan.send_command(self.synscan.AXIS_RA, 'I', '000000')
-        # 停止DEC轴
-        dec_response = self.synscan.send_command(self.synscan.AXIS_DEC, 'I', '000000')
-
-        if ra_response and dec_response:
-            self.log("✓ 所有轴已停止")
-        elif ra_response:
-            self.log("⚠ RA轴已停止, DEC轴停止失败")
-        elif dec_response:
-            self.log("⚠ DEC轴已停止, RA轴停止失败")
-        else:
-            self.log("✗ 所有轴停止失败")
+        syn = self.synscan
+
+        def _do():
+            # 两轴的I指令作为一组发送(锁内连续完成，按命令间隙节流)
+            ra_response, dec_response = syn.send_commands_batch([
+                (syn.AXIS_RA, 'I', '000000'),
+                (syn.AXIS_DEC, 'I', '000000'),
+            ])
+
+            if ra_response and dec_response:
+                self.log("✓ 所有轴已停止")
+            elif ra_response:
+                self.log("⚠ RA轴已停止, DEC轴停止失败")
+            elif dec_response:
+                self.log("⚠ DEC轴已停止, RA轴停止失败")
+            else:
+                self.log("✗ 所有轴停止失败")
+        self._submit_io(_do)
 
-    def update_ra_speed_display(self, value):
-        """更新RA速度显示"""
-        speed = int(float(value))
-        speed_hex = f"{speed:06X}"
-        self.ra_speed_label.config(text=f"{speed} ({speed_hex})")
+    def update_ra_speed_display(self, value=None):
+        """更新RA速度显示(拖动时合并为每30ms一次)"""
+        self._schedule_speed_label('ra')
 
-    def update_dec_speed_display(self, value):
-        """更新DEC速度显示"""
-        speed = int(float(value))
-        speed_hex = f"{speed:06X}"
-        self.dec_speed_label.config(text=f"{speed} ({speed_hex})")
+    def update_dec_speed_display(self, value=None):
+        """更新DEC速度显示(拖动时合并为每30ms一次)"""
+        self._schedule_speed_label('dec')
+
+    def _schedule_speed_label(self, axis: str):
+        if axis in self._speed_lbl_pending:
+            return
+        self._speed_lbl_pending.add(axis)
+        self.root.after(30, self._flush_speed_label, axis)
+
+    def _flush_speed_label(self, axis: str):
+        """读取滑块当前值，文本变化时才更新速度标签"""
+        self._speed_lbl_pending.discard(axis)
+        var, text_var = ((self.ra_speed_var, self._ra_speed_text_var) if axis == 'ra'
+                         else (self.dec_speed_var, self._dec_speed_text_var))
+        speed = int(var.get())
+        text = f"{speed} ({speed:06X})"
+        if text != self._speed_lbl_text.get(axis):
+            self._speed_lbl_text[axis] = text
+            text_var.set(text)
 
     def set_ra_speed(self):
         """设置RA轴速度"""
@@ -1244,15 +1828,55 @@ class SkyWatcherUI:
         speed_hex = f"{speed:06X}"
 
         self.log(f"正在设置RA轴速度: {speed} ({speed_hex})...")
+        syn = self.synscan
 
-        response = self.synscan.send_command(self.synscan.AXIS_RA, 'I', speed_hex)
-        if response is not None:
-            self.log(f"✓ RA轴速度已设置为 {speed}")
-        else:
-            self.log("✗ 设置RA轴速度失败")
+        def _do():
+            response = syn.send_command(syn.AXIS_RA, 'I', speed_hex)
+            if response is not None:
+                self.log(f"✓ RA轴速度已设置为 {speed}")
+            else:
+                self.log("✗ 设置RA轴速度失败")
+        self._submit_io(_do)
 
     # —— 联动回调：RA 度/时分秒 与 DEC 双输入 ——
-    def _on_ra_deg_changed(self):
+    # 坐标联动去抖: 连续输入时只在停顿50ms后同步一次；RA/DEC各一个槽位，最后一次编辑为准
+    _SYNC_DEBOUNCE_MS = 50
+
+    def _debounce_sync(self, key: str, fn):
+        pending = self._sync_after.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending[0])
+        self._sync_after[key] = (self.root.after(self._SYNC_DEBOUNCE_MS, self._run_sync, key), fn)
+
+    def _run_sync(self, key: str):
+        pending = self._sync_after.pop(key, None)
+        if pending is not None:
+            pending[1]()
+
+    def _flush_coord_sync(self):
+        """立即执行尚未触发的联动(GOTO前调用，保证读取到最新输入)"""
+        for key in list(self._sync_after):
+            after_id, fn = self._sync_after.pop(key)
+            self.root.after_cancel(after_id)
+            fn()
+
+    def _on_ra_deg_changed(self, *args):
+        if not getattr(self, '_suppress_ra_sync', False):
+            self._debounce_sync('ra', self._do_ra_deg_sync)
+
+    def _on_ra_hms_changed(self, *args):
+        if not getattr(self, '_suppress_ra_sync', False):
+            self._debounce_sync('ra', self._do_ra_hms_sync)
+
+    def _on_dec1_changed(self, *args):
+        if not getattr(self, '_suppress_dec_sync', False):
+            self._debounce_sync('dec', self._do_dec1_sync)
+
+    def _on_dec2_changed(self, *args):
+        if not getattr(self, '_suppress_dec_sync', False):
+            self._debounce_sync('dec', self._do_dec2_sync)
+
+    def _do_ra_deg_sync(self):
         if getattr(self, '_suppress_ra_sync', False):
             return
         try:
@@ -1271,15 +1895,15 @@ class SkyWatcherUI:
                 m = 0
                 h = (h + 1) % 24
             self._suppress_ra_sync = True
-            self.goto_ra_h_var.set(str(h))
-            self.goto_ra_m_var.set(str(m))
-            self.goto_ra_s_var.set(str(s))
+            _set_if_changed(self.goto_ra_h_var, str(h))
+            _set_if_changed(self.goto_ra_m_var, str(m))
+            _set_if_changed(self.goto_ra_s_var, str(s))
             self._suppress_ra_sync = False
         except Exception:
             # 忽略非法输入
             pass
 
-    def _on_ra_hms_changed(self):
+    def _do_ra_hms_sync(self):
         if getattr(self, '_suppress_ra_sync', False):
             return
         try:
@@ -1301,29 +1925,29 @@ class SkyWatcherUI:
             ra_hours = h + m / 60.0 + s / 3600.0
             ra_deg = (ra_hours * 15.0) % 360.0
             self._suppress_ra_sync = True
-            self.goto_ra_var.set(f"{ra_deg:.6f}")
+            _set_if_changed(self.goto_ra_var, f"{ra_deg:.6f}")
             self._suppress_ra_sync = False
         except Exception:
             pass
 
-    def _on_dec1_changed(self):
+    def _do_dec1_sync(self):
         if getattr(self, '_suppress_dec_sync', False):
             return
         try:
             v = float(self.goto_dec_var.get())
             self._suppress_dec_sync = True
-            self.goto_dec2_var.set(f"{v:.6f}")
+            _set_if_changed(self.goto_dec2_var, f"{v:.6f}")
             self._suppress_dec_sync = False
         except Exception:
             pass
 
-    def _on_dec2_changed(self):
+    def _do_dec2_sync(self):
         if getattr(self, '_suppress_dec_sync', False):
             return
         try:
             v = float(self.goto_dec2_var.get())
             self._suppress_dec_sync = True
-            self.goto_dec_var.set(f"{v:.6f}")
+            _set_if_changed(self.goto_dec_var, f"{v:.6f}")
             self._suppress_dec_sync = False
         except Exception:
             pass
@@ -1339,12 +1963,15 @@ class SkyWatcherUI:
         speed_hex = f"{speed:06X}"
 
         self.log(f"正在设置DEC轴速度: {speed} ({speed_hex})...")
+        syn = self.synscan
 
-        response = self.synscan.send_command(self.synscan.AXIS_DEC, 'I', speed_hex)
-        if response is not None:
-            self.log(f"✓ DEC轴速度已设置为 {speed}")
-        else:
-            self.log("✗ 设置DEC轴速度失败")
+        def _do():
+            response = syn.send_command(syn.AXIS_DEC, 'I', speed_hex)
+            if response is not None:
+                self.log(f"✓ DEC轴速度已设置为 {speed}")
+            else:
+                self.log("✗ 设置DEC轴速度失败")
+        self._submit_io(_do)
 
     def set_preset_speed(self, speed):
         """设置预设速度到两个轴"""
@@ -1384,81 +2011,88 @@ class SkyWatcherUI:
             self.log("✗ 预设地点不存在")
             return
         # 记录当前观测地（用于随机目标的地平高度筛选）
-        self.obs_lat, self.obs_lon = lat, lon
-        self.obs_loc_name = name
+        self._set_observer(lat, lon, name)
 
 
         self.log(f"应用地点: {name} (lat={lat:.4f}, lon={lon:.4f})")
-        # 设备
-        if self.synscan:
-            try:
-                ok = self.synscan.set_location(lat, lon, 0)
-                self.log("✓ 设备地点已设置" if ok else "✗ 设备地点设置失败")
-            except Exception as e:
-                self.log(f"✗ 设备地点设置异常: {e}")
+        # 设备(串口I/O线程)与Stellarium(网络I/O线程)互不依赖，同时下发
+        syn = self.synscan
+        if syn:
+            def _do_dev():
+                try:
+                    ok = syn.set_location(lat, lon, 0)
+                    self.log("✓ 设备地点已设置" if ok else "✗ 设备地点设置失败")
+                except Exception as e:
+                    self.log(f"✗ 设备地点设置异常: {e}")
+            self._submit_io(_do_dev)
         else:
             self.log("! 设备未连接，跳过设备地点设置")
-        # Stellarium
-        if self.stellarium_sync:
-            try:
-                ok2 = self.stellarium_sync.set_location(lat, lon, 0, name=name)
-                self.log("✓ Stellarium地点已设置" if ok2 else "✗ Stellarium地点设置失败")
-            except Exception as e:
-                self.log(f"✗ Stellarium地点设置异常: {e}")
+        sync = self.stellarium_sync
+        if sync:
+            def _do_stel():
+                try:
+                    ok2 = sync.set_location(lat, lon, 0, name=name)
+                    self.log("✓ Stellarium地点已设置" if ok2 else "✗ Stellarium地点设置失败")
+                except Exception as e:
+                    self.log(f"✗ Stellarium地点设置异常: {e}")
+            self._submit_net(_do_stel)
         else:
             self.log("! Stellarium未连接，跳过Stellarium地点设置")
         # 更新UI GPS标签
         if hasattr(self, 'gps_label'):
             ns = 'N' if lat >= 0 else 'S'
             ew = 'E' if lon >= 0 else 'W'
-            self.gps_label.config(text=f"{abs(lat):.4f}°{ns}, {abs(lon):.4f}°{ew}")
+            self._gps_var.set(f"{abs(lat):.4f}°{ns}, {abs(lon):.4f}°{ew}")
+
+    # 节气预设的近似(月, 日)，取当年该日中午12:00
+    _SOLAR_MD = {
+        "春分": (3, 20),
+        "夏至": (6, 21),
+        "秋分": (9, 22),
+        "冬至": (12, 21),
+    }
 
     def _solar_preset_datetime(self, preset: str, tz_hours: int) -> datetime:
-        year = datetime.now().year
         tzinfo = timezone(timedelta(hours=int(tz_hours)))
-        # 简化：使用常见近似日期的中午12:00
-        month_day = {
-            "春分": (3, 20),
-            "夏至": (6, 21),
-            "秋分": (9, 22),
-            "冬至": (12, 21),
-        }
-        if preset in month_day:
-            m, d = month_day[preset]
-            return datetime(year, m, d, 12, 0, 0, tzinfo=tzinfo)
-        return datetime.now(tz=tzinfo)
+        now = datetime.now(tz=tzinfo)
+        md = self._SOLAR_MD.get(preset)
+        if md is None:
+            return now
+        return datetime(now.year, md[0], md[1], 12, 0, 0, tzinfo=tzinfo)
 
     def apply_time_to_both(self):
         preset = getattr(self, 'env_time_preset_var', None).get() if hasattr(self, 'env_time_preset_var') else "当前时间"
-        try:
-            tz_hours = int(self.env_tz_var.get()) if hasattr(self, 'env_tz_var') else 0
-        except Exception:
-            tz_hours = 0
+        tz_hours = self._tz_hours
         dt_local = self._solar_preset_datetime(preset, tz_hours)
         self.log(f"应用时间/时区: {preset}, 本地时间={dt_local.isoformat()} (UTC{tz_hours:+d})")
-        # 设备：下发本地时间和时区
-        if self.synscan:
-            try:
-                ok = self.synscan.set_time(dt_local.year, dt_local.month, dt_local.day,
-                                           dt_local.hour, dt_local.minute, dt_local.second,
-                                           tz_hours)
-                self.log("✓ 设备时间/时区已设置" if ok else "✗ 设备时间设置失败")
-            except Exception as e:
-                self.log(f"✗ 设备时间设置异常: {e}")
+        # 设备：下发本地时间和时区(串口I/O线程)；与Stellarium设置同时进行
+        syn = self.synscan
+        if syn:
+            def _do_dev():
+                try:
+                    ok = syn.set_time(dt_local.year, dt_local.month, dt_local.day,
+                                      dt_local.hour, dt_local.minute, dt_local.second,
+                                      tz_hours)
+                    self.log("✓ 设备时间/时区已设置" if ok else "✗ 设备时间设置失败")
+                except Exception as e:
+                    self.log(f"✗ 设备时间设置异常: {e}")
+            self._submit_io(_do_dev)
         else:
             self.log("! 设备未连接，跳过设备时间设置")
-        # Stellarium：设置时区偏移 + UTC时间(JD)
-        if self.stellarium_sync:
-            try:
-                self.stellarium_sync.set_timezone_shift_hours(float(tz_hours))
-            except Exception as e:
-                self.log(f"! Stellarium时区设置异常: {e}")
-            try:
-                dt_utc = dt_local.astimezone(timezone.utc)
-                ok2 = self.stellarium_sync.set_time(dt_utc)
-                self.log("✓ Stellarium时间已设置" if ok2 else "✗ Stellarium时间设置失败")
-            except Exception as e:
-                self.log(f"✗ Stellarium时间设置异常: {e}")
+        # Stellarium：设置时区偏移 + UTC时间(JD)(网络I/O线程)
+        sync = self.stellarium_sync
+        if sync:
+            def _do_stel():
+                try:
+                    sync.set_timezone_shift_hours(float(tz_hours))
+                except Exception as e:
+                    self.log(f"! Stellarium时区设置异常: {e}")
+                try:
+                    ok2 = sync.set_time(dt_local.astimezone(timezone.utc))
+                    self.log("✓ Stellarium时间已设置" if ok2 else "✗ Stellarium时间设置失败")
+                except Exception as e:
+                    self.log(f"✗ Stellarium时间设置异常: {e}")
+            self._submit_net(_do_stel)
         else:
             self.log("! Stellarium未连接，跳过Stellarium时间设置")
 
@@ -1475,236 +2109,354 @@ class SkyWatcherUI:
             count = 10
         self.random_goto_running = True
         self.log(f"开始随机GOTO：共{count}个目标")
-        self.random_goto_thread = threading.Thread(target=self._random_goto_worker, args=(count,), daemon=True)
-        self.random_goto_thread.start()
-
-
-    def _julian_day(self, dt_utc: datetime) -> float:
-        """UTC -> Julian Day (简化版，足够用于恒星时计算)"""
-        y, m = dt_utc.year, dt_utc.month
-        d = dt_utc.day + (dt_utc.hour + (dt_utc.minute + (dt_utc.second + dt_utc.microsecond/1e6)/60.0)/60.0)/24.0
-        if m <= 2:
-            y -= 1
-            m += 12
-        A = y // 100
-        B = 2 - A + A // 4
-        jd = int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + d + B - 1524.5
-        return jd
+        # 由 after() 驱动的状态机：选点 -> 发送GOTO(I/O线程) -> 每0.5秒检查是否到达 -> 下一个
+        self._rg_count = count
+        self._rg_index = 0
+        self._rg_read_pending = False
+        self._rg_pending = None
+        self._rg_pending_t = None
+        self._rg_stdout_lines = 0
+        self._rg_ensure_location()
+        self._rg_after_id = self.root.after(0, self._random_goto_step)
 
     def _lst_deg(self, dt_utc: datetime, lon_deg: float) -> float:
         """计算地方恒星时(度)。lon_deg 东经为正。"""
-        jd = self._julian_day(dt_utc)
-        T = (jd - 2451545.0) / 36525.0
-        gmst = 280.46061837 + 360.98564736629 * (jd - 2451545.0) \
-               + 0.000387933 * T*T - (T**3) / 38710000.0
-        lst = (gmst + lon_deg) % 360.0
-        return lst
+        return (gmst_deg(dt_utc) + lon_deg) % 360.0
+
+    def _set_observer(self, lat: float, lon: float, name: str):
+        """设置观测地，并预先计算纬度的 sin/cos 供地平坐标计算复用"""
+        self.obs_lat, self.obs_lon = lat, lon
+        self.obs_loc_name = name
+        lat_rad = math.radians(lat)
+        self._obs_lat_sincos = (lat, math.sin(lat_rad), math.cos(lat_rad))
+        # 观测地变化后，已缓存的随机GOTO候选不再可靠
+        self._rg_pending = None
+
+    def _lat_sincos(self, lat_deg: float):
+        """返回纬度的 (sin, cos)；与当前观测地一致时直接使用缓存"""
+        cached = getattr(self, '_obs_lat_sincos', None)
+        if cached is not None and cached[0] == lat_deg:
+            return cached[1], cached[2]
+        lat = math.radians(lat_deg)
+        return math.sin(lat), math.cos(lat)
 
     def _altitude_deg(self, ra_deg: float, dec_deg: float, lat_deg: float, lon_deg: float, dt_utc: datetime) -> float:
         """给定RA/DEC与观察者经纬度和UTC时间，计算地平高度(度)。"""
-        lst = self._lst_deg(dt_utc, lon_deg)
-        H = math.radians((lst - (ra_deg % 360.0)) % 360.0)
-        lat = math.radians(lat_deg)
-        dec = math.radians(dec_deg)
-        sin_alt = math.sin(dec) * math.sin(lat) + math.cos(dec) * math.cos(lat) * math.cos(H)
-        sin_alt = max(-1.0, min(1.0, sin_alt))
+        return self._alt_az_deg(ra_deg, dec_deg, lat_deg, lon_deg, dt_utc)[0]
+
     def _alt_az_deg(self, ra_deg: float, dec_deg: float, lat_deg: float, lon_deg: float, dt_utc: datetime):
         """给定目标赤道坐标与观测者位置/UTC时间，返回(高度, 方位)（度）。方位以正北为0°，向东为正，范围0-360。"""
+        sin, cos, radians, degrees = math.sin, math.cos, math.radians, math.degrees
         lst = self._lst_deg(dt_utc, lon_deg)
-        H = math.radians((lst - (ra_deg % 360.0)) % 360.0)
-        lat = math.radians(lat_deg)
-        dec = math.radians(dec_deg)
+        H = radians((lst - (ra_deg % 360.0)) % 360.0)
+        sin_lat, cos_lat = self._lat_sincos(lat_deg)
+        dec = radians(dec_deg)
+        sin_dec, cos_dec, cos_H = sin(dec), cos(dec), cos(H)
         # 高度
-        sin_alt = math.sin(dec) * math.sin(lat) + math.cos(dec) * math.cos(lat) * math.cos(H)
+        sin_alt = sin_dec * sin_lat + cos_dec * cos_lat * cos_H
         sin_alt = max(-1.0, min(1.0, sin_alt))
-        alt = math.asin(sin_alt)
-        # 方位（0°=北，90°=东）
-        y = -math.sin(H) * math.cos(dec)
-        x = math.sin(dec) * math.cos(lat) - math.cos(dec) * math.sin(lat) * math.cos(H)
-        az = math.atan2(y, x)
-        alt_deg = math.degrees(alt)
-        az_deg = (math.degrees(az) + 360.0) % 360.0
+        alt_deg = degrees(math.asin(sin_alt))
+        # 方位（0°=北，90°=东；Python 取模结果非负，无需先加360）
+        y = -sin(H) * cos_dec
+        x = sin_dec * cos_lat - cos_dec * sin_lat * cos_H
+        az_deg = degrees(math.atan2(y, x)) % 360.0
         return alt_deg, az_deg
 
-
+    def _alt_az_arrays(self, ra_deg: np.ndarray, dec_deg: np.ndarray, lat_deg: float, lon_deg: float, dt_utc: datetime):
+        """_alt_az_deg 的向量化版本：LST与纬度三角函数只算一次，一次性计算整批目标的(高度, 方位)数组（度）"""
+        lst = self._lst_deg(dt_utc, lon_deg)
+        sin_lat, cos_lat = self._lat_sincos(lat_deg)
+        H = np.deg2rad((lst - ra_deg % 360.0) % 360.0)
+        dec = np.deg2rad(dec_deg)
+        sin_dec, cos_dec = np.sin(dec), np.cos(dec)
+        cos_H = np.cos(H)
+        sin_alt = np.clip(sin_dec * sin_lat + cos_dec * cos_lat * cos_H, -1.0, 1.0)
+        alt_deg = np.degrees(np.arcsin(sin_alt))
+        az = np.arctan2(-np.sin(H) * cos_dec, sin_dec * cos_lat - cos_dec * sin_lat * cos_H)
+        az_deg = np.degrees(az) % 360.0
+        return alt_deg, az_deg
 
     def _angular_sep_deg(self, ra1_deg: float, dec1_deg: float, ra2_deg: float, dec2_deg: float) -> float:
-        """计算两点(赤道坐标)之间的大圆角距离(度)"""
+        """计算两点(赤道坐标)之间的大圆角距离(度)，Haversine 公式在小角距时数值稳定"""
         try:
-            r1 = math.radians(ra1_deg % 360.0)
-            r2 = math.radians(ra2_deg % 360.0)
             d1 = math.radians(max(-90.0, min(90.0, dec1_deg)))
             d2 = math.radians(max(-90.0, min(90.0, dec2_deg)))
-            dr = (r1 - r2) % (2 * math.pi)
-            cos_sep = math.sin(d1) * math.sin(d2) + math.cos(d1) * math.cos(d2) * math.cos(dr)
-            cos_sep = max(-1.0, min(1.0, cos_sep))
-            return math.degrees(math.acos(cos_sep))
+            sin_ddec = math.sin((d2 - d1) * 0.5)
+            sin_dra = math.sin(math.radians(ra2_deg - ra1_deg) * 0.5)
+            h = sin_ddec * sin_ddec + math.cos(d1) * math.cos(d2) * sin_dra * sin_dra
+            return math.degrees(2.0 * math.asin(math.sqrt(min(1.0, h))))
         except Exception:
             return 999.0
 
-    def _random_goto_worker(self, count: int):
-        import random
-        THRESHOLD = 1.0  # 角距阈值(度)
-        MAX_WAIT_S = 300  # 单个目标的最大等待时间(秒)
-        if True:
-            # 若已设置地点，则按地平高度>5°筛选随机目标
-            obs_lat = getattr(self, 'obs_lat', None)
-            obs_lon = getattr(self, 'obs_lon', None)
-            alt_filter_enabled = (obs_lat is not None and obs_lon is not None)
-            if not alt_filter_enabled:
-                # 使用默认地点（北京）启用高度筛选，并更新UI显示
-                try:
-                    default_name = "北京" if hasattr(self, "_preset_locations") and "北京" in self._preset_locations else list(self._preset_locations.keys())[0]
-                    lat, lon = self._preset_locations[default_name]
-                except Exception:
-                    default_name, lat, lon = "默认", 39.9, 116.4
-                self.obs_lat, self.obs_lon = lat, lon
-                self.obs_loc_name = default_name
-                # 同步到本地变量，避免后续使用旧的 None 值
-                obs_lat, obs_lon = lat, lon
-                alt_filter_enabled = True
-                # 更新UI变量显示（放入主线程）
-                if hasattr(self, "root"):
-                    try:
-                        if hasattr(self, "env_loc_var"):
-                            self.root.after(0, lambda: self.env_loc_var.set(default_name))
-                    except Exception:
-                        pass
-                    try:
-                        if hasattr(self, "env_tz_var"):
-                            self.root.after(0, lambda: self.env_tz_var.set("+8"))
-                    except Exception:
-                        pass
-                info_msg = f"! 未设置地点，已使用默认地点：{default_name} (lat={lat:.4f}, lon={lon:.4f})"
-                try:
-                    if hasattr(self, 'gps_label') and hasattr(self, 'root'):
-                        ns = 'N' if lat >= 0 else 'S'
-                        ew = 'E' if lon >= 0 else 'W'
-                        text = f"{abs(lat):.4f}°{ns}, {abs(lon):.4f}°{ew}"
-                        self.root.after(0, lambda t=text: self.gps_label.config(text=t))
-                except Exception:
-                    pass
-
-                self.log(info_msg)
-                print(info_msg, flush=True)
-
-            for i in range(count):
-                if not self.random_goto_running:
-                    break
-                # 生成随机RA/DEC，并（若可）筛选地平高度>5°
-                attempts = 0
-                while True:
-                    ra_deg = random.uniform(0, 360)
-                    dec_deg = random.uniform(-60, 60)
-                    if not alt_filter_enabled:
-                        alt_ok = True
-                        alt_deg = None
-                    else:
-                        dt_utc = datetime.now(timezone.utc)
-                        alt_deg, az_deg = self._alt_az_deg(ra_deg, dec_deg, obs_lat, obs_lon, dt_utc)
-                        alt_ok = (alt_deg is not None and alt_deg > 5.0)
-                    if alt_ok:
-                        break
-                    attempts += 1
-                    if attempts > 200:
-                        self.log("! 多次尝试仍未找到地平高度>5°的目标，跳过本次")
-                        break
-                if attempts > 200:
-                    continue
-
-                if alt_filter_enabled:
-                    self.log(f"[{i+1}/{count}] 随机GOTO到 RA={ra_deg:.2f}°, DEC={dec_deg:.2f}° (地平高度≈{alt_deg:.2f}°，方位≈{az_deg:.2f}°) ...")
-                else:
-                    self.log(f"[{i+1}/{count}] 随机GOTO到 RA={ra_deg:.2f}°, DEC={dec_deg:.2f}° ...")
-                # 基础参数输出（日志 + 控制台）
-                try:
-                    tz_hours = int(self.env_tz_var.get()) if hasattr(self, 'env_tz_var') else 0
-                except Exception:
-                    tz_hours = 0
-                use_dt_utc = dt_utc if alt_filter_enabled else datetime.now(timezone.utc)
-                dt_local = use_dt_utc.astimezone(timezone(timedelta(hours=int(tz_hours))))
-                loc_name = getattr(self, 'obs_loc_name', None)
-                lat = getattr(self, 'obs_lat', None)
-                lon = getattr(self, 'obs_lon', None)
-                if lat is not None and lon is not None:
-                    ns = 'N' if lat >= 0 else 'S'
-                    ew = 'E' if lon >= 0 else 'W'
-                    gps_str = f"{abs(lat):.4f}°{ns}, {abs(lon):.4f}°{ew}"
-                else:
-                    gps_str = "未知"
-                alt_str = f"{alt_deg:.2f}°" if alt_filter_enabled else "N/A"
-                az_str  = f"{az_deg:.2f}°" if alt_filter_enabled else "N/A"
-                label = f"T{i+1}"
-                base_msg = (f"基础参数：地点={loc_name or '未知'} | GPS={gps_str} | 时间={dt_local.isoformat()} | 时区=UTC{int(tz_hours):+d} | "
-                            f"目标 RA={ra_deg:.2f}° DEC={dec_deg:.2f}° | 高度={alt_str} | 方位={az_str} | 标签={label}")
-                self.log(base_msg)
-                print(base_msg, flush=True)
-
-                # 在Stellarium中标记该目标点，并加上序号标签（T1、T2...）
-                if self.stellarium_sync:
-                    try:
-                        self.stellarium_sync.next_color()
-                        self.stellarium_sync.mark_point(ra_deg, dec_deg, style="circle", size=8.0, label=label)
-                    except Exception:
-                        pass
-
-                try:
-                    ok = self.synscan.goto_ra_dec(ra_deg, dec_deg)
-                    if not ok:
-                        self.log("✗ 发送GOTO失败，跳过")
-                        continue
-                except Exception as e:
-                    self.log(f"✗ 随机GOTO异常: {e}")
-                    continue
-
-                # 等待到达: 基于自动监控数据(current_ra/current_dec)判断角距 < 1°
-                start_t = time.time()
-                last_log_t = 0.0
-                while self.random_goto_running:
-                    cra, cdec = self.current_ra, self.current_dec
-                    # 若未开启监控或尚未更新，则尝试主动读取
-                    if (cra is None or cdec is None) and self.synscan and not self.running:
-                        pos = self.synscan.get_ra_dec()
-                        if pos:
-                            cra, cdec = pos
-                            self.current_ra, self.current_dec = pos
-                    if cra is not None and cdec is not None:
-                        sep = self._angular_sep_deg(cra, cdec, ra_deg, dec_deg)
-                        # 分别计算 RA/DEC 的差值（RA 取最小环差）
-                        dra = abs(((cra - ra_deg + 180.0) % 360.0) - 180.0)
-                        ddec = abs(cdec - dec_deg)
-                        now = time.time()
-                        if sep <= THRESHOLD:
-                            msg = (f"  ✓ 已到达：当前 RA={cra:.2f}° DEC={cdec:.2f}° | 目标 RA={ra_deg:.2f}° DEC={dec_deg:.2f}° | "
-                                   f"ΔRA≈{dra:.2f}° ΔDEC≈{ddec:.2f}° (总角距≈{sep:.2f}°)")
-                            self.log(msg)
-                            print(msg, flush=True)
-                            break
-                        if now - last_log_t >= 2.5:
-                            msg = (f"  … 当前 RA={cra:.2f}° DEC={cdec:.2f}° | 目标 RA={ra_deg:.2f}° DEC={dec_deg:.2f}° | "
-                                   f"ΔRA≈{dra:.2f}° ΔDEC≈{ddec:.2f}° (总角距≈{sep:.2f}°)，继续等待(<{THRESHOLD}°)")
-                            self.log(msg)
-                            print(msg, flush=True)
-                            last_log_t = now
-                    time.sleep(0.5)
-                    if time.time() - start_t > MAX_WAIT_S:
-                        self.log("  ⚠ 等待超时，继续下一个目标")
-                        break
+    def _angular_sep_arrays(self, ra1_deg: float, dec1_deg: float, ra2_deg: np.ndarray, dec2_deg: np.ndarray) -> np.ndarray:
+        """_angular_sep_deg 的向量化版本：一个点到一批点的大圆角距离数组(度)"""
+        d1 = math.radians(max(-90.0, min(90.0, dec1_deg)))
+        d2 = np.deg2rad(np.clip(dec2_deg, -90.0, 90.0))
+        sin_ddec = np.sin((d2 - d1) * 0.5)
+        sin_dra = np.sin(np.deg2rad(ra2_deg - ra1_deg) * 0.5)
+        h = sin_ddec * sin_ddec + math.cos(d1) * np.cos(d2) * sin_dra * sin_dra
+        return np.degrees(2.0 * np.arcsin(np.sqrt(np.minimum(h, 1.0))))
+
+    # 随机GOTO参数
+    _RG_THRESHOLD = 1.0  # 角距阈值(度)
+    _RG_MAX_WAIT_S = 300  # 单个目标的最大等待时间(秒)
+    _RG_POLL_MS = 500  # 到达检查间隔(毫秒)
+    _RG_CANDIDATES = 256  # 每次批量筛选的随机候选数
+    _RG_BATCH_TTL_S = 60  # 可见候选缓存有效期(秒)，期间天球转动约0.25°，不影响>5°筛选
+    _RG_SIN_DEC_MAX = math.sin(math.radians(60.0))  # 随机目标赤纬范围 ±60°
+    _RG_SIN_MIN_ALT = math.sin(math.radians(5.0))  # 随机目标最低地平高度 5°
+    _RG_STDOUT_FLUSH_LINES = 8  # 控制台输出每累计N行刷新一次
+
+    def _rg_ensure_location(self):
+        """随机GOTO按地平高度>5°筛选目标；未设置地点时使用默认地点（北京）并更新UI显示"""
+        if getattr(self, 'obs_lat', None) is not None and getattr(self, 'obs_lon', None) is not None:
+            return
+        try:
+            default_name = "北京" if hasattr(self, "_preset_locations") and "北京" in self._preset_locations else next(iter(self._preset_locations))
+            lat, lon = self._preset_locations[default_name]
+        except Exception:
+            default_name, lat, lon = "默认", 39.9, 116.4
+        self._set_observer(lat, lon, default_name)
+        if hasattr(self, "env_loc_var"):
+            self.env_loc_var.set(default_name)
+        if hasattr(self, "env_tz_var"):
+            self.env_tz_var.set("+8")
+        if hasattr(self, 'gps_label'):
+            ns = 'N' if lat >= 0 else 'S'
+            ew = 'E' if lon >= 0 else 'W'
+            self._gps_var.set(f"{abs(lat):.4f}°{ns}, {abs(lon):.4f}°{ew}")
 
+        info_msg = f"! 未设置地点，已使用默认地点：{default_name} (lat={lat:.4f}, lon={lon:.4f})"
+        self.log(info_msg)
+        self._rg_print(info_msg, flush=True)
 
+    def _rg_print(self, msg: str, flush: bool = False):
+        """随机GOTO的控制台输出：缓冲写入，每 _RG_STDOUT_FLUSH_LINES 行或指定 flush 时刷新"""
+        try:
+            sys.stdout.write(msg + "\n")
+            self._rg_stdout_lines += 1
+            if flush or self._rg_stdout_lines >= self._RG_STDOUT_FLUSH_LINES:
+                sys.stdout.flush()
+                self._rg_stdout_lines = 0
+        except Exception:
+            pass
 
+    def _rg_next(self, delay_ms: int = 0):
+        """进入下一个随机目标"""
+        self._rg_index += 1
+        self._rg_after_id = self.root.after(delay_ms, self._random_goto_step)
+
+    def _sample_visible_targets(self, obs_lat: float, obs_lon: float, dt_utc: datetime):
+        """在地平高度>5°的天区内按面积均匀生成一批随机目标，返回 (ra, dec, alt, az) 数组。
+        按可见时角宽度对赤纬做逆CDF取样，再在可见时角范围内取时角，候选基本全部可用。"""
+        n = self._RG_CANDIDATES
+        sin_lat, cos_lat = self._lat_sincos(obs_lat)
+        min_alt = self._RG_SIN_MIN_ALT
+
+        def half_width(sin_dec):
+            # 高度=5°的边界: cos H0 = (sin5° - sinφ·sinδ) / (cosφ·cosδ)；<=-1 全天可见，>=1 不可见
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cos_h0 = (min_alt - sin_lat * sin_dec) / (cos_lat * np.sqrt(1.0 - sin_dec * sin_dec))
+            return np.nan_to_num(np.arccos(np.clip(cos_h0, -1.0, 1.0)))
+
+        # 以 sin(dec) 为变量(天球面均匀)，各赤纬的权重为可见时角宽度 H0，数值积分得到CDF
+        grid = np.linspace(-self._RG_SIN_DEC_MAX, self._RG_SIN_DEC_MAX, 513)
+        h0_grid = half_width(grid)
+        cdf = np.concatenate(([0.0], np.cumsum(h0_grid[1:] + h0_grid[:-1])))
+        if cdf[-1] <= 0.0:
+            empty = np.empty(0)
+            return empty, empty, empty, empty
+        sin_dec = np.interp(np.random.uniform(0.0, cdf[-1], n), cdf, grid)
+        H = np.random.uniform(-1.0, 1.0, n) * half_width(sin_dec)
+        ra_arr = (self._lst_deg(dt_utc, obs_lon) - np.degrees(H)) % 360.0
+        dec_arr = np.degrees(np.arcsin(sin_dec))
+        alt_arr, az_arr = self._alt_az_arrays(ra_arr, dec_arr, obs_lat, obs_lon, dt_utc)
+        vis = alt_arr > 5.0  # 边界上的浮点误差
+        return ra_arr[vis], dec_arr[vis], alt_arr[vis], az_arr[vis]
+
+    def _rg_pick_target(self, obs_lat: float, obs_lon: float, dt_utc: datetime):
+        """从缓存的可见候选中取下一个(用完或超过 _RG_BATCH_TTL_S 时按 dt_utc 重新生成)，无可用候选返回None"""
+        pending = self._rg_pending
+        if (pending is None or pending[0].size == 0
+                or (dt_utc - self._rg_pending_t).total_seconds() > self._RG_BATCH_TTL_S):
+            pending = self._sample_visible_targets(obs_lat, obs_lon, dt_utc)
+            self._rg_pending_t = dt_utc
+        ra_arr, dec_arr, alt_arr, az_arr = pending
+        # 已知当前指向时，排除与当前位置几乎重合的候选(否则会被立即判定为已到达)
+        cra, cdec = self.current_ra, self.current_dec
+        if cra is not None and cdec is not None:
+            hits = np.flatnonzero(self._angular_sep_arrays(cra, cdec, ra_arr, dec_arr) > self._RG_THRESHOLD)
+        else:
+            hits = np.arange(ra_arr.size)
+        if hits.size == 0:
+            self._rg_pending = None
+            return None
+        k = hits[0]
+        self._rg_pending = tuple(a[k + 1:] for a in pending)
+        return float(ra_arr[k]), float(dec_arr[k]), float(alt_arr[k]), float(az_arr[k])
+
+    def _random_goto_step(self):
+        """随机GOTO: 生成一个地平高度>5°的随机目标并发送GOTO(Tk主线程)"""
+        self._rg_after_id = None
+        if not self.random_goto_running:
+            return
+        if self._rg_index >= self._rg_count:
+            self._rg_finish()
+            return
+        i, count = self._rg_index, self._rg_count
+        obs_lat, obs_lon = self.obs_lat, self.obs_lon
+
+        # 从批量生成的可见候选中取一个；本目标的筛选与日志共用同一个UTC时间
+        dt_utc = datetime.now(timezone.utc)
+        target = self._rg_pick_target(obs_lat, obs_lon, dt_utc)
+        if target is None:
+            self.log("! 多次尝试仍未找到地平高度>5°的目标，跳过本次")
+            self._rg_next()
+            return
+        ra_deg, dec_deg, alt_deg, az_deg = target
+
+        self.log(f"[{i+1}/{count}] 随机GOTO到 RA={ra_deg:.2f}°, DEC={dec_deg:.2f}° (地平高度≈{alt_deg:.2f}°，方位≈{az_deg:.2f}°) ...")
+        # 基础参数输出（日志 + 控制台）
+        tz_hours = self._tz_hours
+        dt_local = dt_utc.astimezone(timezone(timedelta(hours=tz_hours)))
+        loc_name = self.obs_loc_name
+        ns = 'N' if obs_lat >= 0 else 'S'
+        ew = 'E' if obs_lon >= 0 else 'W'
+        gps_str = f"{abs(obs_lat):.4f}°{ns}, {abs(obs_lon):.4f}°{ew}"
+        label = f"T{i+1}"
+        base_msg = (f"基础参数：地点={loc_name or '未知'} | GPS={gps_str} | 时间={dt_local.isoformat()} | 时区=UTC{tz_hours:+d} | "
+                    f"目标 RA={ra_deg:.2f}° DEC={dec_deg:.2f}° | 高度={alt_deg:.2f}° | 方位={az_deg:.2f}° | 标签={label}")
+        self.log(base_msg)
+        self._rg_print(base_msg)
+
+        # 在Stellarium中标记该目标点，并加上序号标签（T1、T2...）
+        sync = self.stellarium_sync
+        if sync:
+            sync.next_color()
+            self._submit_net(functools.partial(sync.mark_point, ra_deg, dec_deg, style="circle", size=8.0, label=label))
+
+        syn = self.synscan
+
+        def _send():
+            try:
+                ok = syn.goto_ra_dec(ra_deg, dec_deg)
+            except Exception as e:
+                self.log(f"✗ 随机GOTO异常: {e}")
+                ok = False
+            self._post_ui(self._rg_goto_sent, ok, ra_deg, dec_deg)
+        self._submit_io(_send)
+
+    def _rg_goto_sent(self, ok: bool, ra_deg: float, dec_deg: float):
+        """GOTO发送结果回到Tk主线程：失败则跳过，成功则开始等待到达"""
+        if not self.random_goto_running:
+            return
+        if not ok:
+            self.log("✗ 发送GOTO失败，跳过")
+            self._rg_next()
+            return
+        self._rg_target = (ra_deg, dec_deg)
+        self._rg_start_t = time.time()
+        self._rg_last_log_t = 0.0
+        self._rg_prev_sep = None
+        self._rg_after_id = self.root.after(self._RG_POLL_MS, self._rg_wait_arrival)
+
+    def _rg_read_position(self):
+        """未开启监控时主动读取一次位置(I/O线程)"""
+        try:
+            self.current_ra, self.current_dec = self.synscan.get_ra_dec()
+        except MountReadError:
+            pass
+        finally:
+            self._rg_read_pending = False
 
+    def _rg_wait_arrival(self):
+        """等待到达: 基于自动监控数据(current_ra/current_dec)判断角距 < 1°"""
+        self._rg_after_id = None
+        if not self.random_goto_running:
+            return
+        ra_deg, dec_deg = self._rg_target
+        cra, cdec = self.current_ra, self.current_dec
+        # 未开启监控时由I/O线程在后台读取位置(每次检查投递一次，上次未完成则不重复)，
+        # 本次使用已有的 current_ra/current_dec，检查本身只读属性不等待串口
+        if self.synscan and not self.running and not self._rg_read_pending:
+            self._rg_read_pending = True
+            self._submit_io(self._rg_read_position)
+        delay_ms = self._RG_POLL_MS
+        now = time.time()
+        if cra is not None and cdec is not None:
+            threshold = self._RG_THRESHOLD
+            sep = self._angular_sep_deg(cra, cdec, ra_deg, dec_deg)
+            delay_ms = self._rg_poll_delay_ms(sep)
+            # 日志文本只在需要输出时才拼接
+            if sep <= threshold:
+                msg = f"  ✓ 已到达：{self._rg_progress_text(cra, cdec, ra_deg, dec_deg, sep)}"
+                self.log(msg)
+                self._rg_print(msg, flush=True)
+                self._rg_next()
+                return
+            if now - self._rg_last_log_t >= 2.5:
+                msg = f"  … {self._rg_progress_text(cra, cdec, ra_deg, dec_deg, sep)}，继续等待(<{threshold}°)"
+                self.log(msg)
+                self._rg_print(msg)
+                self._rg_last_log_t = now
+        if now - self._rg_start_t > self._RG_MAX_WAIT_S:
+            self.log("  ⚠ 等待超时，继续下一个目标")
+            self._rg_next()
+            return
+        self._rg_after_id = self.root.after(delay_ms, self._rg_wait_arrival)
+
+    @staticmethod
+    def _rg_progress_text(cra: float, cdec: float, ra_deg: float, dec_deg: float, sep: float) -> str:
+        """当前/目标位置及差值的日志文本(RA 取最小环差)"""
+        dra = abs(((cra - ra_deg + 180.0) % 360.0) - 180.0)
+        ddec = abs(cdec - dec_deg)
+        return (f"当前 RA={cra:.2f}° DEC={cdec:.2f}° | 目标 RA={ra_deg:.2f}° DEC={dec_deg:.2f}° | "
+                f"ΔRA≈{dra:.2f}° ΔDEC≈{ddec:.2f}° (总角距≈{sep:.2f}°)")
+
+    def _rg_poll_delay_ms(self, sep: float) -> int:
+        """按角距与估算的回转速度决定下次检查间隔：远离目标时放慢(≤2秒)，接近时加快(≥0.2秒)"""
+        now = time.time()
+        prev = self._rg_prev_sep
+        if prev is not None and sep == prev[0]:
+            # 位置尚未更新(监控每秒一次)，保持上次的速度估计基准
+            return self._RG_POLL_MS
+        self._rg_prev_sep = (sep, now)
+        if prev is None:
+            return self._RG_POLL_MS
+        dt = now - prev[1]
+        rate = (prev[0] - sep) / dt if dt > 0 else 0.0  # 度/秒，正值表示正在接近
+        if rate <= 1e-3:
+            return self._RG_POLL_MS
+        return int(max(0.2, min(2.0, sep / rate * 0.3)) * 1000)
+
+    def _rg_finish(self):
+        """结束随机GOTO序列"""
+        if self._rg_after_id is not None:
+            self.root.after_cancel(self._rg_after_id)
+            self._rg_after_id = None
         self.random_goto_running = False
+        if self._rg_stdout_lines:
+            sys.stdout.flush()
+            self._rg_stdout_lines = 0
         self.log("随机GOTO完成或已停止")
 
     def stop_random_goto_sequence(self):
         if self.random_goto_running:
-            self.random_goto_running = False
             self.log("已请求停止随机GOTO")
+            self._rg_finish()
         else:
             self.log("! 随机GOTO未在进行")
 
 
     def run(self):
         """运行UI主循环"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            # 通知常驻线程退出
+            self._shutdown.set()
+            self._stop_evt.set()
+            self._go.set()
+            self._io.shutdown(wait=False)
+            self._net.shutdown(wait=False)
+            self.logger.removeHandler(self._log_handler)
@@ -8,6 +8,8 @@ Stellarium远程控制脚本 - 在指定位置绘制方框
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import logging
 from datetime import datetime
@@ -15,6 +17,11 @@ from typing import Optional
 from pathlib import Path
 
 
+# 方框标签脚本模板(方位角, 高度角)；标签ID记入脚本引擎全局数组，下一帧按ID删除
+_LABEL_CORNER_FMT = '_boxLabelIds.push(LabelMgr.labelHorizon("■", %.6f, %.6f, true, 16, "#ff0000"));'
+_LABEL_CENTER_FMT = '_boxLabelIds.push(LabelMgr.labelHorizon("✚", %.6f, %.6f, true, 20, "#ffff00"));'
+
+
 class StellariumController:
     """Stellarium远程控制器"""
 
@@ -29,6 +36,13 @@ class StellariumController:
         self.base_url = base_url.rstrip('/')
         self.api_url = f"{self.base_url}/api"
 
+        # 复用同一HTTP会话(keep-alive)，周期绘制时无需每次重新建立连接；
+        # 连接失败快速重试，状态码重试仅限幂等方法，POST脚本不会被重复执行
+        self.session = requests.Session()
+        retry = Retry(total=2, connect=2, read=0, backoff_factor=0.1,
+                      status_forcelist=(502, 503, 504), raise_on_status=False)
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry))
+
         # 设置日志
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
@@ -82,7 +96,7 @@ class StellariumController:
         self.logger.debug("-" * 60)
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/scripts/direct",
                 data={"code": script}
             )
@@ -120,7 +134,7 @@ class StellariumController:
 
         try:
             # 使用API直接设置位置
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/location/setlocationfields",
                 data={
                     "latitude": str(latitude),
@@ -141,6 +155,43 @@ class StellariumController:
             print(error_msg)
             return None
     
+    # 方框四角相对中心的单位偏移(乘以方框大小): 左下, 右下, 右上, 左上
+    BOX_CORNER_OFFSETS = ((-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5))
+
+    # 清除所有标记和标签的脚本行
+    CLEAR_LINES = [
+        "LabelMgr.deleteAllLabels();",
+        "MarkerMgr.deleteAllMarkers();",
+        "_boxLabelIds = [];",
+    ]
+
+    # 只删除上一帧本程序创建的标签(按记录的ID)，不影响其他脚本的标记
+    DELETE_OWN_LINES = [
+        'if (typeof _boxLabelIds !== "undefined") { for (var i = 0; i < _boxLabelIds.length; i++) { LabelMgr.deleteLabel(_boxLabelIds[i]); } }',
+        "_boxLabelIds = [];",
+    ]
+
+    # 不删除旧标签时，确保ID数组已存在
+    INIT_IDS_LINES = [
+        'if (typeof _boxLabelIds === "undefined") { _boxLabelIds = []; }',
+    ]
+
+    def _box_script_lines(self, azimuth: float, altitude: float, size: float = 5.0) -> list:
+        """
+        生成在指定地平坐标绘制方框的脚本行(四角 + 中心十字)
+
+        Args:
+            azimuth: 方位角 (0-360度, 0为北, 90为东, 180为南, 270为西)
+            altitude: 高度角 (-90到90度, 0为地平线, 90为天顶)
+            size: 方框大小 (度)
+        """
+        # 构建Stellarium脚本 - 使用LabelMgr.labelHorizon绘制
+        # 四个角使用红色方块(角点 = 中心 + 单位偏移 * 大小)，中心绘制黄色十字
+        script_lines = [_LABEL_CORNER_FMT % (azimuth + dx * size, altitude + dy * size)
+                        for dx, dy in self.BOX_CORNER_OFFSETS]
+        script_lines.append(_LABEL_CENTER_FMT % (azimuth, altitude))
+        return script_lines
+
     def draw_box_at_position(self, azimuth: float, altitude: float, size: float = 5.0):
         """
         在指定的方位角和高度角位置绘制方框
@@ -151,45 +202,25 @@ class StellariumController:
             altitude: 高度角 (-90到90度, 0为地平线, 90为天顶)
             size: 方框大小 (度)
         """
-        half_size = size / 2
-
-        # 计算方框的四个角
-        corners = [
-            (azimuth - half_size, altitude - half_size),  # 左下
-            (azimuth + half_size, altitude - half_size),  # 右下
-            (azimuth + half_size, altitude + half_size),  # 右上
-            (azimuth - half_size, altitude + half_size),  # 左上
-        ]
-
-        # 构建Stellarium脚本 - 使用LabelMgr.labelHorizon绘制
-        script_lines = []
-
-        # 绘制四个角的标签
-        for i, (az, alt) in enumerate(corners):
-            # 使用方块符号,红色
-            script_lines.append(
-                f'LabelMgr.labelHorizon("■", {az}, {alt}, true, 16, "#ff0000");'
-            )
+        self.logger.info(f"在方位角{azimuth}°, 高度角{altitude}°绘制方框 (大小: {size}°)")
+        print(f"在方位角{azimuth}°, 高度角{altitude}°绘制方框")
+        return self.draw_frame(self._box_script_lines(azimuth, altitude, size), refresh=False)
 
-        # 在中心绘制一个十字标记
-        script_lines.append(
-            f'LabelMgr.labelHorizon("✚", {azimuth}, {altitude}, true, 20, "#ffff00");'
-        )
+    def draw_frame(self, lines: list, refresh: bool = True):
+        """
+        一次脚本请求绘制一帧: refresh 为 True 时先按ID删除上一帧的标签，省去单独的清除请求
 
-        script = "\n".join(script_lines)
+        Args:
+            lines: 本帧的脚本行
+            refresh: 是否先删除本程序上一帧绘制的标签
+        """
+        head = self.DELETE_OWN_LINES if refresh else self.INIT_IDS_LINES
+        return self.execute_script("\n".join(head + list(lines)))
 
-        self.logger.info(f"在方位角{azimuth}°, 高度角{altitude}°绘制方框 (大小: {size}°)")
-        print(f"在方位角{azimuth}°, 高度角{altitude}°绘制方框")
-        return self.execute_script(script)
-    
     def clear_markers(self):
         """清除所有标记和标签"""
         self.logger.info("清除所有标记和标签")
-        script = """
-LabelMgr.deleteAllLabels();
-MarkerMgr.deleteAllMarkers();
-"""
-        return self.execute_script(script)
+        return self.execute_script("\n".join(self.CLEAR_LINES))
     
     def run_periodic_drawing(self, azimuth: float, altitude: float, interval: int = 2, duration: Optional[int] = None):
         """
@@ -210,6 +241,9 @@ MarkerMgr.deleteAllMarkers();
         print(f"开始周期性绘制 - 方位角: {azimuth}°, 高度角: {altitude}°, 间隔: {interval}秒")
         print("按Ctrl+C停止...")
 
+        # 位置与大小在整个循环中不变，方框脚本只生成一次
+        frame_lines = self._box_script_lines(azimuth, altitude)
+
         start_time = time.time()
         count = 0
 
@@ -227,10 +261,12 @@ MarkerMgr.deleteAllMarkers();
                 timestamp = time.strftime('%H:%M:%S')
                 self.logger.info(f"[{count}] {timestamp} - 开始绘制")
                 print(f"\n[{count}] {timestamp} - 绘制方框...")
-                self.draw_box_at_position(azimuth, altitude)
+                # 删除上一帧标签与绘制本帧合并为一次请求
+                self.draw_frame(frame_lines)
 
-                # 等待指定间隔
-                time.sleep(interval)
+                # 按固定节拍等待(以开始时间为基准，扣除绘制耗时，避免周期累积漂移)
+                next_deadline = start_time + count * interval
+                time.sleep(max(0.0, next_deadline - time.time()))
 
         except KeyboardInterrupt:
             msg = f"用户中断,共绘制了{count}次"
@@ -251,7 +287,7 @@ def main():
     # 测试连接
     print("\n测试API连接...")
     try:
-        response = requests.get(f"{controller.base_url}/api/main/status")
+        response = controller.session.get(f"{controller.base_url}/api/main/status")
         if response.status_code == 200:
             print("✓ API连接成功!")
         else: